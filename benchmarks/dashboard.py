@@ -0,0 +1,89 @@
+"""
+Static stand-ins for the dashboard pages the checks in src/ drive.
+
+Only the DOM shape the locators depend on is reproduced: the location list used
+by check_locations, the location settings form read by check_ui_against_api
+(including its positional XPaths) and the devices page walked by room_click_count.
+"""
+from html import escape
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>{body}</body></html>"""
+
+FORM_INPUT_CLASS = "ng-untouched ng-pristine ng-valid"
+
+
+def _row(label, value_html):
+    return f"<div class='row'><div>{escape(label)}</div><div>{value_html}</div></div>"
+
+
+def _input(value, css_class=FORM_INPUT_CLASS):
+    return f"<input class='{css_class}' placeholder='{escape(str(value))}'>"
+
+
+def _select(text):
+    return f"<div class='mat-select-trigger'><span>{escape(text)}</span></div>"
+
+
+def location_list(tenant):
+    items = "".join(
+        "<div class='mat-list-item'>"
+        "<span class='mat-radio-outer-circle'></span>"
+        f"<div class='scroll-text'>{escape(loc['location_name'])}</div>"
+        "</div>"
+        for loc in sorted(tenant.locations, key=lambda loc: loc["sortid"])
+    )
+    body = f"<div class='location-list'>{items}</div><button><span class='mat-button-wrapper'>Next</span></button>"
+    return PAGE.format(title="Locations", body=body)
+
+
+def location_settings(tenant, loc_id):
+    loc = tenant.by_id.get(loc_id)
+    if loc is None:
+        return PAGE.format(title="Not found", body="<p>Unknown location</p>")
+    settings = tenant.settings(loc_id)
+    energy = settings["energy_in"].split("$$")
+    # Row positions matter: check_ui_against_api reads //div[7]//div[2],
+    # //div[8]//div[2]//input[1], //div[11]//div[2]//input[1] and the 5th form input
+    rows = [
+        _row("Location name", _input(loc["location_name"])),
+        _row("Country", escape(f"Country {loc['country_id']}")),
+        _row("Address", _input("1 Bench Street")),
+        _row("Zip", _input("00000")),
+        _row("Holiday calendar",
+             "<label class='mat-slide-toggle-label mat-checked'>"
+             "<input id='mat-slide-toggle-1-input' type='checkbox' aria-checked='true'></label>"),
+        _row("Currency", f"<mat-label>{escape(settings['cost_in'])}</mat-label>"),
+        _row("Timezone", escape(f"Zone {loc['timezone_id']} (UTC+0{loc['timezone_id']}:00)")),
+        _row("Cost per KWh", _input(energy[2])),
+        _row("Trees per kWh", _input(settings["env_in"].split("$")[-1])),
+        _row("Notes", ""),
+        _row("Feed in tariff", _input(energy[-1], css_class="ng-untouched ng-pristine")),
+        _row("Temperature", _select("°C")),
+        _row("Savings", _select("Trees")),
+        _row("Fuel", _select("Litres")),
+        _row("Device state retain", _select("5 sec")),
+    ]
+    return PAGE.format(title="Location settings", body=f"<div class='abc'>{''.join(rows)}</div>")
+
+
+def devices(tenant, loc_id):
+    rooms = [r for r in tenant.rooms(loc_id)["rooms"] if not r["is_default"]]
+    panels = "".join(
+        "<mat-expansion-panel>"
+        f"<mat-expansion-panel-header id='mat-expansion-panel-header-{i}' style='display:block'>"
+        f"{escape(room['room_name'])}</mat-expansion-panel-header>"
+        "</mat-expansion-panel>"
+        for i, room in enumerate(rooms)
+    )
+    return PAGE.format(title="Devices", body=panels)
+
+
+def render(path, tenant):
+    parts = [p for p in path.split("/") if p]
+    if parts[:1] == ["locationsetting"] and len(parts) == 2:
+        return location_settings(tenant, parts[1])
+    if parts[:1] == ["devices"] and len(parts) == 2:
+        return devices(tenant, parts[1])
+    return location_list(tenant)
@@ -0,0 +1,289 @@
+"""
+Locator cost profiler.
+
+Collects every (By.*, selector) locator used in src/ (by reading the source,
+with f-string / .format placeholders filled from sample values), evaluates
+each one in headless Chrome against saved page snapshots and reports the
+evaluation time and match count per snapshot:
+
+    python -m benchmarks.locators --stand-in --locations 1000
+    python -m benchmarks.locators snapshots/*.html --json locators.json
+
+Snapshots are plain HTML files, e.g. written by ActionDriver.save_snapshot()
+during a real run. Relative XPath locators ('.//...') are evaluated from the
+container their module passes to read_fields(scope=...) / find_within().
+Locators are flagged when they scan the whole document, depend on position,
+match an exact class attribute or match nothing at all.
+"""
+import argparse
+import ast
+import json
+import re
+import tempfile
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Placeholder expression (as written in src/) -> value used to build the locator
+SAMPLES = {
+    "loc_name": "Location 00000",
+    "expected['country']": "Country 1",
+    "expected['cost_in']": "USD",
+}
+INDEX_EXPR = re.compile(r"(i|idx|index|radio_index)( [+-] \d+)?")
+
+# Relative locators ('.//', '(.//...)[n]') are evaluated from the first match
+# of their container; a page without the container reports no match.
+PROFILE_JS = """
+const [locators, repeats] = arguments;
+const evaluate = (how, selector, context) => how === 'xpath'
+    ? document.evaluate(selector, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null)
+    : context.querySelectorAll(selector);
+const first = result => result.snapshotItem ? result.snapshotItem(0) : result[0];
+const size = result => result.snapshotLength !== undefined ? result.snapshotLength : result.length;
+return locators.map(([how, selector, scope]) => {
+    let context = document;
+    let count;
+    try {
+        if (scope) {
+            context = first(evaluate(scope[0], scope[1], document));
+            if (!context) return {count: 0, us: 0, scope: 'not found'};
+        }
+        count = size(evaluate(how, selector, context));
+    } catch (e) {
+        return {error: String(e)};
+    }
+    const run = () => size(evaluate(how, selector, context));
+    const start = performance.now();
+    for (let r = 0; r < repeats; r++) run();
+    return {count: count, us: (performance.now() - start) * 1000 / repeats};
+});
+"""
+
+
+class _Resolver:
+    """Turns a locator expression from src/ into a concrete selector string, or None"""
+
+    def __init__(self, tree, samples):
+        self.samples = samples
+        self.names = {}
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+                self.names.setdefault(node.targets[0].id, node.value)
+
+    def placeholder(self, node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, int):
+            return str(node.value)
+        source = ast.unparse(node)
+        if source in self.samples:
+            return self.samples[source]
+        if INDEX_EXPR.fullmatch(source):
+            return "1"
+        return self.resolve(node)
+
+    def resolve(self, node, depth=0):
+        if depth > 5:
+            return None
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        if isinstance(node, ast.Name) and node.id in self.names:
+            return self.resolve(self.names[node.id], depth + 1)
+        if isinstance(node, ast.JoinedStr):
+            parts = []
+            for value in node.values:
+                part = self.resolve(value, depth + 1) if isinstance(value, ast.Constant) else self.placeholder(value.value)
+                if part is None:
+                    return None
+                parts.append(part)
+            return "".join(parts)
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr == "format"):
+            template = self.resolve(node.func.value, depth + 1)
+            args = [self.placeholder(arg) for arg in node.args]
+            if template is None or None in args:
+                return None
+            return template.format(*args)
+        return None
+
+
+def _by_attr(node):
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "By":
+        return node.attr
+    return None
+
+
+def _relative(by, selector):
+    return by == "XPATH" and re.match(r"\(*\.", selector) is not None
+
+
+def _containers(tree, resolver):
+    """(by, selector) of every container passed as read_fields(scope=...) or find_within(container, ...)"""
+    containers = set()
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+            continue
+        exprs = [kw.value for kw in node.keywords if kw.arg == "scope"] if node.func.attr == "read_fields" else []
+        if node.func.attr == "find_within" and node.args:
+            exprs.append(node.args[0])
+        for expr in exprs:
+            if isinstance(expr, ast.Name) and expr.id in resolver.names:
+                expr = resolver.names[expr.id]
+            if isinstance(expr, ast.Tuple) and len(expr.elts) == 2 and _by_attr(expr.elts[0]):
+                selector = resolver.resolve(expr.elts[1])
+                if selector is not None:
+                    containers.add((_by_attr(expr.elts[0]), selector))
+    return containers
+
+
+def collect_locators(src_dir=SRC_DIR, samples=SAMPLES):
+    """
+    Returns [{by, selector, scope, where}] for every distinct locator in
+    src_dir, plus unresolved sites. scope is the (by, selector) container a
+    relative locator is evaluated from (the module's read_fields scope /
+    find_within container), None for document-wide ones.
+    """
+    found, unresolved = {}, []
+    for path in sorted(Path(src_dir).glob("*.py")):
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        resolver = _Resolver(tree, samples)
+        containers = _containers(tree, resolver)
+        for node in ast.walk(tree):
+            pair = None
+            if isinstance(node, ast.Tuple) and len(node.elts) == 2 and _by_attr(node.elts[0]):
+                pair = node.elts
+            elif isinstance(node, ast.Call) and len(node.args) == 2 and _by_attr(node.args[0]):
+                pair = node.args
+            if pair is None:
+                continue
+            where = f"{path.name}:{node.lineno}"
+            selector = resolver.resolve(pair[1])
+            if selector is None:
+                unresolved.append(f"{where} {ast.unparse(pair[1])}")
+            elif not _relative(_by_attr(pair[0]), selector):
+                found.setdefault((_by_attr(pair[0]), selector, None), []).append(where)
+            elif len(containers) == 1:
+                # Relative locators only make sense from their container
+                found.setdefault((_by_attr(pair[0]), selector, next(iter(containers))), []).append(where)
+            else:
+                unresolved.append(f"{where} {selector} (relative, no single container)")
+    locators = [
+        {"by": by, "selector": selector, "scope": scope, "where": where}
+        for (by, selector, scope), where in found.items()
+    ]
+    return locators, unresolved
+
+
+def fragility(locator, counts):
+    by, selector = locator["by"], locator["selector"]
+    notes = []
+    if by == "XPATH" and re.match(r"\(*//", selector):
+        notes.append("document scan")
+    if re.search(r"\[\d+\]", selector):
+        notes.append("positional")
+    if "@class='" in selector or '@class="' in selector:
+        notes.append("exact class")
+    if counts and not any(counts):
+        notes.append("no match")
+    return notes
+
+
+def stand_in_snapshots(locations, rooms, directory):
+    """Renders the stand-in dashboard pages into directory"""
+    from benchmarks.dashboard import devices, location_list, location_settings
+    from benchmarks.stand_in import FakeTenant
+
+    tenant = FakeTenant(locations=locations, rooms_per_location=rooms)
+    loc_id = tenant.locations[-1]["location_id"]
+    pages = {
+        "location_list": location_list(tenant),
+        "location_settings": location_settings(tenant, loc_id),
+        "devices": devices(tenant, loc_id),
+    }
+    paths = []
+    for name, html in pages.items():
+        path = Path(directory) / f"{name}.html"
+        path.write_text(html, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def profile(snapshots, locators, repeats):
+    from benchmarks.run import _start_browser
+    from src.action_driver import ActionDriver
+    from selenium.webdriver.common.by import By
+
+    def spec(by, selector):
+        return list(ActionDriver._js_locator((getattr(By, by), selector)))
+
+    specs = [
+        spec(loc["by"], loc["selector"]) + [spec(*loc["scope"]) if loc["scope"] else None]
+        for loc in locators
+    ]
+    rows = [dict(loc, snapshots={}) for loc in locators]
+    driver = _start_browser()
+    try:
+        for snapshot in snapshots:
+            driver.get(Path(snapshot).resolve().as_uri())
+            for row, result in zip(rows, driver.execute_script(PROFILE_JS, specs, repeats)):
+                row["snapshots"][Path(snapshot).stem] = result
+    finally:
+        driver.quit()
+
+    for row in rows:
+        results = row["snapshots"].values()
+        row["worst_us"] = round(max((r.get("us", 0) for r in results), default=0), 2)
+        row["notes"] = fragility(row, [r.get("count", 0) for r in results])
+    rows.sort(key=lambda row: row["worst_us"], reverse=True)
+    return rows
+
+
+def print_report(rows, unresolved):
+    names = list(rows[0]["snapshots"]) if rows else []
+    print(f"{'worst µs':>9}  " + "  ".join(f"{name[:14]:>14}" for name in names) + "  locator")
+    for row in rows:
+        counts = "  ".join(
+            f"{'error' if 'error' in r else r['count']:>14}" for r in row["snapshots"].values()
+        )
+        scope = f"  (within {row['scope'][1]})" if row["scope"] else ""
+        print(f"{row['worst_us']:>9.1f}  {counts}  {row['by']} {row['selector']}{scope}")
+        print(f"{'':>9}  {', '.join(row['where'])}" + (f"  [{', '.join(row['notes'])}]" if row["notes"] else ""))
+    if unresolved:
+        print(f"\n{len(unresolved)} locator(s) could not be built from the source (add --sample values):")
+        for site in unresolved:
+            print(f"  {site}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate every locator in src/ against page snapshots")
+    parser.add_argument("snapshots", nargs="*", help="saved HTML pages")
+    parser.add_argument("--stand-in", action="store_true", help="also profile the stand-in dashboard pages")
+    parser.add_argument("--locations", type=int, default=1000, help="locations rendered by --stand-in")
+    parser.add_argument("--rooms", type=int, default=4, help="rooms per location rendered by --stand-in")
+    parser.add_argument("--repeats", type=int, default=200, help="evaluations per locator and snapshot")
+    parser.add_argument("--sample", action="append", default=[], metavar="EXPR=VALUE",
+                        help="value for a placeholder expression, e.g. loc_name='Head Office'")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    samples = dict(SAMPLES)
+    for item in args.sample:
+        expr, _, value = item.partition("=")
+        samples[expr] = value
+
+    locators, unresolved = collect_locators(samples=samples)
+    with tempfile.TemporaryDirectory() as directory:
+        snapshots = list(args.snapshots)
+        if args.stand_in:
+            snapshots += stand_in_snapshots(args.locations, args.rooms, directory)
+        if not snapshots:
+            parser.error("give snapshot files and/or --stand-in")
+        rows = profile(snapshots, locators, args.repeats)
+
+    print_report(rows, unresolved)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"locators": rows, "unresolved": unresolved}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Offline benchmark for the location checks.
+
+Runs each scenario against a local BonePlus stand-in (see stand_in.py) and
+reports wall-clock time, API request count and WebDriver round trips:
+
+    python -m benchmarks.run --locations 10 100 1000 --latency-ms 30
+    python -m benchmarks.run --ui --ui-limit 25        # also drive headless Chrome
+"""
+import argparse
+import json
+import os
+import time
+
+from benchmarks.stand_in import FakeTenant, StandIn
+from src.http_client import ApiClient
+from src.locations_api import location_ids_count, location_settings_api
+from src.prefetch import prefetch
+
+HEADERS = {"access_token": "benchmark"}
+
+
+class RoundTripCounter:
+    """Counts WebDriver commands by wrapping driver.execute"""
+
+    def __init__(self, driver):
+        self.count = 0
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            self.count += 1
+            return execute(driver_command, params)
+
+        driver.execute = counted_execute
+
+
+def api_sequential(stand_in, **_):
+    """Baseline: one request after another, no cache, no prefetch"""
+    client = ApiClient(cache_ttl=0)
+    _, location_ids, country_ids, timezone_ids, _, _ = location_ids_count(stand_in.base_url, HEADERS, client)
+    for loc_id, c_id, t_id in zip(location_ids, country_ids, timezone_ids):
+        location_settings_api(loc_id, c_id, t_id, stand_in.base_url, HEADERS, parallel=False, client=client)
+    client.close()
+
+
+def api_pipelined(stand_in, **_):
+    """Parallel fan-out + shared cache + prefetch, as check_locations runs it"""
+    client = ApiClient()
+    _, location_ids, country_ids, timezone_ids, _, _ = location_ids_count(stand_in.base_url, HEADERS, client)
+
+    def fetch(loc):
+        return location_settings_api(*loc, stand_in.base_url, HEADERS, client=client)
+
+    for _, settings in prefetch(zip(location_ids, country_ids, timezone_ids), fetch):
+        settings.result()
+    client.close()
+
+
+def _new_failures(before):
+    """Non-passing result statuses recorded in the sink since `before` (a sink.counts() snapshot)"""
+    from src.results import QUIET, sink
+
+    after = sink.counts()
+    return {
+        status: after[status] - before.get(status, 0)
+        for status in after
+        if status not in QUIET and after[status] > before.get(status, 0)
+    }
+
+
+def ui_presence(stand_in, driver, action, **_):
+    """Location list presence check, through check_location_list as check_locations runs it"""
+    from src.location_check import check_location_list
+    from src.results import sink
+
+    names = [loc["location_name"] for loc in stand_in.tenant.locations]
+    driver.get(f"{stand_in.base_url}/")
+    before = sink.counts()
+    missing = check_location_list(action, names)
+    assert not missing, f"Stand-in list is missing {missing[:5]}"
+    assert not _new_failures(before), f"Presence check recorded {_new_failures(before)}"
+
+
+def ui_settings(stand_in, driver, action, ui_limit, **_):
+    """check_ui_against_api on the first ui_limit locations"""
+    from src.results import sink
+    from src.scheduler_check import check_ui_against_api
+
+    client = ApiClient()
+    before = sink.counts()
+    for loc in stand_in.tenant.locations[:ui_limit]:
+        response = location_settings_api(
+            loc["location_id"], loc["country_id"], loc["timezone_id"], stand_in.base_url, HEADERS, client=client
+        )
+        driver.get(f"{stand_in.base_url}/locationsetting/{loc['location_id']}")
+        assert check_ui_against_api(driver, response), f"Settings page of {loc['location_id']} did not match"
+    client.close()
+    assert not _new_failures(before), f"Settings check recorded {_new_failures(before)}"
+
+
+def ui_rooms(stand_in, driver, action, ui_limit, **_):
+    """Room header harvesting and clicking, through the helpers room_click_count uses"""
+    from src.results import sink
+    from src.rooms import open_rooms, ui_room_headers
+
+    before = sink.counts()
+    for loc in stand_in.tenant.locations[:ui_limit]:
+        driver.get(f"{stand_in.base_url}/devices/{loc['location_id']}")
+        headers = ui_room_headers(action)
+        open_rooms(action, headers, loc["location_name"], loc["location_id"])
+        assert len(headers) == stand_in.tenant.rooms_per_location, (
+            f"{loc['location_id']}: {len(headers)} room headers, expected {stand_in.tenant.rooms_per_location}"
+        )
+    assert not _new_failures(before), f"Room clicks recorded {_new_failures(before)}"
+
+
+API_SCENARIOS = [api_sequential, api_pipelined]
+UI_SCENARIOS = [ui_presence, ui_settings, ui_rooms]
+
+
+def _start_browser():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1366,900")
+    driver_path = os.getenv("CHROMEDRIVER_PATH")
+    service = Service(driver_path) if driver_path else Service()
+    return webdriver.Chrome(service=service, options=options)
+
+
+def run(location_counts, rooms, latency_ms, ui, ui_limit):
+    results = []
+    driver = action = counter = None
+    if ui:
+        from src.action_driver import ActionDriver
+
+        driver = _start_browser()
+        counter = RoundTripCounter(driver)
+        action = ActionDriver(driver, timeout=10)
+
+    try:
+        for count in location_counts:
+            tenant = FakeTenant(locations=count, rooms_per_location=rooms)
+            with StandIn(tenant, latency_ms=latency_ms) as stand_in:
+                for scenario in API_SCENARIOS + (UI_SCENARIOS if ui else []):
+                    stand_in.reset_counts()
+                    trips_before = counter.count if counter else 0
+                    start = time.perf_counter()
+                    scenario(stand_in, driver=driver, action=action, ui_limit=ui_limit)
+                    results.append({
+                        "scenario": scenario.__name__,
+                        "locations": count,
+                        "wall_s": round(time.perf_counter() - start, 3),
+                        "requests": stand_in.total_requests(),
+                        "round_trips": (counter.count - trips_before) if counter else 0,
+                    })
+                    print(_format_row(results[-1]), flush=True)
+    finally:
+        if driver:
+            driver.quit()
+    return results
+
+
+def _format_row(row):
+    return (f"{row['scenario']:<16} {row['locations']:>6} locations  "
+            f"{row['wall_s']:>9.3f} s  {row['requests']:>7} requests  {row['round_trips']:>7} round trips")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark against a local BonePlus stand-in")
+    parser.add_argument("--locations", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--rooms", type=int, default=4, help="non-default rooms per location")
+    parser.add_argument("--latency-ms", type=int, default=30, help="simulated API latency per request")
+    parser.add_argument("--ui", action="store_true", help="also run the headless Chrome scenarios")
+    parser.add_argument("--ui-limit", type=int, default=25, help="locations visited per UI scenario")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = run(args.locations, args.rooms, args.latency_ms, args.ui, args.ui_limit)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
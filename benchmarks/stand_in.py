@@ -0,0 +1,154 @@
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks import dashboard
+
+
+class FakeTenant:
+    """Deterministic BonePlus account data for a given number of locations / rooms"""
+
+    def __init__(self, locations=10, rooms_per_location=4, countries=3, timezones=2):
+        self.locations = [
+            {
+                "location_id": f"loc-{i:05d}",
+                "location_name": f"Location {i:05d}",
+                "country_id": i % countries + 1,
+                "timezone_id": i % timezones + 1,
+                # Served in reverse so callers really have to sort
+                "sortid": i,
+            }
+            for i in reversed(range(locations))
+        ]
+        self.by_id = {loc["location_id"]: loc for loc in self.locations}
+        self.rooms_per_location = rooms_per_location
+
+    def settings(self, loc_id):
+        return {
+            "energy_in": "1$$0$$0.25$$0$$0.08",
+            "env_in": "1$0.04",
+            "hc_date": "1$$2024-01-01",
+            "temp_in": "1",
+            "cost_in": "USD",
+            "funit_in": "0",
+            "location_id": loc_id,
+        }
+
+    def rooms(self, loc_id):
+        rooms = [
+            {"room_id": f"{loc_id}-r{r}", "room_name": f"Room {r}", "is_default": r == 0}
+            for r in range(self.rooms_per_location + 1)
+        ]
+        return {"rooms": rooms, "room_ids": ",".join(r["room_id"] for r in rooms)}
+
+
+def _routes(tenant):
+    """(pattern, handler) pairs; handlers return a JSON-able body or None for 404"""
+
+    def location(match):
+        loc = tenant.by_id.get(match["id"])
+        return loc and {"data": loc}
+
+    def settings(match):
+        return match["id"] in tenant.by_id and {"data": tenant.settings(match["id"])}
+
+    def preference(match):
+        return match["id"] in tenant.by_id and {"data": {"mode": "5$$0", "app_notify": "1$$0"}}
+
+    def devices(match):
+        return match["id"] in tenant.by_id and {"data": tenant.rooms(match["id"])}
+
+    return [
+        (r"/v1/location/get", lambda m: {"data": tenant.locations}),
+        (r"/v1/location/(?P<id>[^/]+)/settings", settings),
+        (r"/v1/location/(?P<id>[^/]+)/get", location),
+        (r"/v1/location/preference/(?P<id>[^/]+)/get", preference),
+        (r"/v1/location/device/(?P<id>[^/]+)/all", devices),
+        (r"/v1/company-codes/gettimezone", lambda m: {"data": []}),
+        (r"/v1/company-v2/get/(?P<id>\d+)", lambda m: {"data": {"name": f"Country {m['id']}"}}),
+        (r"/v1/timezone/get/(?P<id>\d+)",
+         lambda m: {"data": {"name": f"Zone {m['id']}", "gmtOffsetName": f"UTC+0{m['id']}:00"}}),
+        (r"/v1/user/details", lambda m: {"data": {"name": "Bench User", "email_id": "bench@example.com"}}),
+    ]
+
+
+class StandIn:
+    """
+    Local HTTP stand-in for the BonePlus API and dashboard pages.
+
+    Every API response is delayed by latency_ms to model the production round
+    trip; request counts are kept per route pattern.
+    """
+
+    def __init__(self, tenant, latency_ms=30, host="127.0.0.1", port=0):
+        self.tenant = tenant
+        self.latency = latency_ms / 1000
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        routes = [(re.compile(pattern + r"$"), handler) for pattern, handler in _routes(tenant)]
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if not path.startswith("/v1/"):
+                    return self._send(200, dashboard.render(path, tenant), "text/html")
+
+                time.sleep(stand_in.latency)
+                for pattern, handler in routes:
+                    match = pattern.match(path)
+                    if match:
+                        stand_in._count(pattern.pattern)
+                        body = handler(match)
+                        if body:
+                            return self._send(200, json.dumps(body), "application/json")
+                        break
+                stand_in._count("404")
+                self._send(404, json.dumps({"error": "not found"}), "application/json")
+
+            def _send(self, status, body, content_type):
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key):
+        with self._lock:
+            self.requests[key] += 1
+
+    def reset_counts(self):
+        with self._lock:
+            self.requests.clear()
+
+    def total_requests(self):
+        with self._lock:
+            return sum(self.requests.values())
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,13 +1,26 @@
+import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from src.location_check import location_ids_count
+from src.locations_api import location_ids_count
+from src.location_switch import switch_location
 from src.action_driver import ActionDriver
-import requests
+from src.http_client import get_default_client
+from src.prefetch import prefetch
+from src.results import sink
+from src.tracing import tracer
 
 
-def all_loc_notifyMe(driver, headers, Base_url):
+@tracer.traced("check")
+def all_loc_notifyMe(driver, headers, Base_url, client=None, only=None):
+    """
+    Compares every location's app_notify preference with its Settings toggle.
+
+    only: optional set of location IDs to check (used by the sharded runner);
+    returns location_id -> per-location result.
+    """
     action = ActionDriver(driver)
+    client = client or get_default_client()
     
     # Select the first location
     initial_location = action.wait_for_presence(
@@ -23,86 +36,68 @@ def all_loc_notifyMe(driver, headers, Base_url):
         wait_type="ajax"
     )
 
-    # Open profile menu
-    action.wait_after_action(
-        lambda: action.safe_click((By.CSS_SELECTOR, "#Icon_awesome-user-circle")),
-        wait_type="ajax"
-    )
-
     # Get location details
-    api_locations, location_ids, country_ids, timezone_ids, length_loc, sort_ids = location_ids_count(Base_url, headers)
-
-    for i in range(1, length_loc + 1, 1):
-        print(f"###### Location is {api_locations[i-1]}: id is {location_ids[i-1]}")
-
-        # Select location radio
-        radio_btn = action.wait_for_presence(
-            (By.XPATH, f"(//span[@class='mat-radio-outer-circle'])[{i}]")
-        )
-        driver.execute_script("arguments[0].scrollIntoView(true);", radio_btn)
-        driver.execute_script("arguments[0].click();", radio_btn)
-        action.wait_for_ajax()
-
-        # API call for this location's preferences
-        print(location_ids[i-1])
-        loc_api_resp = requests.get(f"{Base_url}/v1/location/preference/{location_ids[i-1]}/get", headers=headers)
-        if loc_api_resp.status_code != 200:
-            raise Exception(f"Location API failed with status {loc_api_resp.status_code}")
-
-        print("Full API Response:", loc_api_resp.json())
-
-        # Go to "Home" then "Settings"
-        action.wait_after_action(
-            lambda: action.safe_click((By.XPATH, "(//button[@class='mat-tooltip-trigger py-3 optsel'])[1]")),
-            wait_type="ajax"
-        )
-
-        action.wait_after_action(
-            lambda: action.safe_click((By.XPATH, "(//button[@class='mat-tooltip-trigger py-3 optsel'])[5]")),
-            wait_type="ajax"
-        )
-
-        try:
-            api_json = loc_api_resp.json()
-            app_notify_value = api_json["data"]["app_notify"]
-            enabled_flag = app_notify_value.split("$$")[0]  # API flag before $$ if exists
-
-            # Wait for toggle input
-            toggle_input = action.wait_for_presence(
-                (By.XPATH, "//mat-slide-toggle//input[@type='checkbox']"),
-                timeout=20
-            )
-
-            # Read attributes
-            aria_checked = toggle_input.get_attribute("aria-checked")
-            toggle_label = toggle_input.find_element(By.XPATH, "./ancestor::mat-slide-toggle")
-            toggle_classes = toggle_label.get_attribute("class")
-
-            # Debug print
-            print(f"[DEBUG] aria-checked: {aria_checked}, toggle_classes: {toggle_classes}")
-
-            # UI state check
-            is_enabled_in_ui = (aria_checked and aria_checked.lower() == "true") or ("mat-checked" in toggle_classes)
-
-            # Compare API vs UI
-            if enabled_flag == "1":
-                if is_enabled_in_ui:
-                    print(" app_notify toggle is ENABLED in UI and API matches")
-                else:
-                    print("app_notify toggle is NOT enabled in UI but API says enabled")
-            else:
-                if not is_enabled_in_ui:
-                    print(" app_notify toggle is DISABLED in UI and API matches")
-                else:
-                    print("app_notify toggle is ENABLED in UI but API says disabled")
-
-        except Exception as e:
-            print(f" Error checking app_notify toggle: {e}")
-
-        # Reopen profile menu for next location
-        action.wait_after_action(
-            lambda: action.safe_click((By.CSS_SELECTOR, "#Icon_awesome-user-circle")),
-            wait_type="ajax"
-        )
+    api_locations, location_ids, country_ids, timezone_ids, length_loc, sort_ids = location_ids_count(Base_url, headers, client)
+
+    def fetch_preference(loc_id):
+        resp = client.get(f"{Base_url}/v1/location/preference/{loc_id}/get", headers=headers)
+        if resp.status_code != 200:
+            raise Exception(f"Location API failed with status {resp.status_code}")
+        return resp
+
+    # Radio buttons are positional, so keep each location's 1-based index in the full list
+    selected = [
+        (i, loc_id) for i, loc_id in enumerate(location_ids, start=1)
+        if only is None or loc_id in only
+    ]
+    results = {}
+
+    # Preferences for the next locations are fetched while the UI of this one is checked
+    preferences = prefetch(selected, lambda loc: fetch_preference(loc[1]))
+
+    for (i, loc_id), preference in preferences:
+        loc_name = api_locations[i-1]
+        with tracer.span("location", "location", location=loc_name):
+            started = time.perf_counter()
+
+            # Make it the active location and open its Settings view
+            switch_location(action, loc_id, loc_name, i, view="settings")
+
+            # API call for this location's preferences
+            loc_api_resp = preference.result()
+            sink.debug(loc_name, "location_preference", loc_api_resp.json())
+
+            try:
+                api_json = loc_api_resp.json()
+                app_notify_value = api_json["data"]["app_notify"]
+                enabled_flag = app_notify_value.split("$$")[0]  # API flag before $$ if exists
+
+                # Wait for toggle input
+                toggle_input = action.wait_for_presence(
+                    (By.XPATH, "//mat-slide-toggle//input[@type='checkbox']"),
+                    timeout=20
+                )
+
+                # Read attributes
+                aria_checked = toggle_input.get_attribute("aria-checked")
+                toggle_label = toggle_input.find_element(By.XPATH, "./ancestor::mat-slide-toggle")
+                toggle_classes = toggle_label.get_attribute("class")
+
+                sink.debug(loc_name, "app_notify", {"aria-checked": aria_checked, "class": toggle_classes})
+
+                # UI state check
+                is_enabled_in_ui = bool((aria_checked and aria_checked.lower() == "true") or ("mat-checked" in toggle_classes))
+
+                # Compare API vs UI
+                matched = is_enabled_in_ui == (enabled_flag == "1")
+                results[loc_id] = {"location": loc_name, "status": "match" if matched else "mismatch"}
+                sink.record(loc_name, "app_notify", enabled_flag == "1", is_enabled_in_ui,
+                            results[loc_id]["status"], time.perf_counter() - started, location_id=loc_id)
+
+            except Exception as e:
+                results[loc_id] = {"location": loc_name, "status": "error", "error": str(e)}
+                sink.record(loc_name, "app_notify", status="error", duration=time.perf_counter() - started,
+                            location_id=loc_id, error=f"Error checking app_notify toggle: {e}")
 
     print("\nNOTIFY ME VALIDATION COMPLETED")
+    return results
@@ -1,30 +1,371 @@
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException
 from selenium.webdriver.common.by import By
+from src.element_cache import ElementCache
+from src.polling import PollingWait, make_schedule
+from src.routes import CLICK_PATHS, ROUTED_JS, ROUTES, ROUTER_NAVIGATE_JS, fills_template, learn_route, route_of
+from src.tracing import tracer
+import re
 import traceback
 
 
+# Reads that describe element state rather than content only need presence:
+# the native input behind a mat-slide-toggle is never visibly rendered.
+STATE_READS = {"aria-checked", "class"}
+
+READ_FIELDS_JS = """
+const fields = arguments[0];
+const stateReads = arguments[1];
+const scope = arguments[2];
+const result = {values: {}, missing: []};
+
+function find(how, selector, root) {
+    if (how === 'xpath') {
+        return document.evaluate(
+            selector, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+    }
+    return root.querySelector(selector);
+}
+
+function read(el, what) {
+    if (what === 'text') return (el.innerText || el.textContent || '').trim();
+    if (what === 'value') return el.value != null ? String(el.value) : el.getAttribute('value');
+    return el.getAttribute(what);
+}
+
+for (const [name, spec] of Object.entries(fields)) {
+    const [how, selector, reads] = spec;
+    // Relative fields (.//, CSS) are looked up in the container, absolute XPaths in the whole page
+    const relative = how !== 'xpath' || /^\(*\./.test(selector);
+    const el = find(how, selector, (relative && scope) || document);
+    const needsVisible = reads.some(r => !stateReads.includes(r));
+    if (!el || (needsVisible && el.getClientRects().length === 0)) {
+        result.missing.push(name);
+        continue;
+    }
+    let value = null;
+    for (const what of reads) {
+        value = read(el, what);
+        if (value) break;
+    }
+    result.values[name] = value;
+}
+return result;
+"""
+
+DOM_SETTLED_JS = """
+const [quietMs, timeoutMs, done] = arguments;
+let finished = false;
+let quietTimer = null;
+let hardTimer = null;
+let observer = null;
+
+function finish(settled) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(hardTimer);
+    done(settled);
+}
+
+observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(finish, quietMs, true);
+});
+observer.observe(document.documentElement || document, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+quietTimer = setTimeout(finish, quietMs, true);
+hardTimer = setTimeout(finish, timeoutMs, false);
+"""
+
+ANGULAR_STABLE_JS = """
+const [timeoutMs, done] = arguments;
+if (typeof window.getAllAngularTestabilities !== 'function') {
+    done('unsupported');
+    return;
+}
+const testabilities = window.getAllAngularTestabilities();
+if (!testabilities.length) {
+    done('unsupported');
+    return;
+}
+let pending = testabilities.length;
+let finished = false;
+const timer = setTimeout(() => {
+    if (!finished) {
+        finished = true;
+        done('timeout');
+    }
+}, timeoutMs);
+// whenStable fires once zone.js reports no pending macrotasks or HTTP requests
+testabilities.forEach(testability => testability.whenStable(() => {
+    pending -= 1;
+    if (pending === 0 && !finished) {
+        finished = true;
+        clearTimeout(timer);
+        done('stable');
+    }
+}));
+"""
+
+# Counts in-flight fetch/XHR calls; guarded so it installs once per document
+NETWORK_TRACKER_JS = """
+(function () {
+    if (window.__sdetNetwork) return;
+    const state = window.__sdetNetwork = {inflight: 0, lastChange: performance.now()};
+    const begin = () => { state.inflight += 1; state.lastChange = performance.now(); };
+    const end = () => { state.inflight = Math.max(0, state.inflight - 1); state.lastChange = performance.now(); };
+
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function () {
+            begin();
+            try {
+                return originalFetch.apply(this, arguments).finally(end);
+            } catch (e) {
+                end();
+                throw e;
+            }
+        };
+    }
+
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        begin();
+        this.addEventListener('loadend', end, {once: true});
+        try {
+            return originalSend.apply(this, arguments);
+        } catch (e) {
+            end();
+            throw e;
+        }
+    };
+})();
+"""
+
+NETWORK_IDLE_JS = NETWORK_TRACKER_JS + """
+const [idleMs, timeoutMs, done] = arguments;
+const state = window.__sdetNetwork;
+const start = performance.now();
+(function check() {
+    const now = performance.now();
+    if (state.inflight === 0 && now - state.lastChange >= idleMs) return done(true);
+    if (now - start >= timeoutMs) return done(false);
+    setTimeout(check, Math.min(50, idleMs));
+})();
+"""
+
+HARVEST_TEXTS_JS = """
+const [how, selector, ownText] = arguments;
+let nodes = [];
+if (how === 'xpath') {
+    const snapshot = document.evaluate(
+        selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    for (let i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+} else {
+    nodes = Array.from(document.querySelectorAll(selector));
+}
+return nodes.map(el => {
+    const raw = ownText
+        ? Array.from(el.childNodes)
+            .filter(n => n.nodeType === Node.TEXT_NODE)
+            .map(n => n.textContent)
+            .join(' ')
+        : el.textContent;
+    return raw.replace(/\\s+/g, ' ').trim();
+});
+"""
+
+# Shared by the scroll-and-harvest scripts: matched nodes, their scroll
+# container (nearest scrollable ancestor, e.g. a cdk-virtual-scroll-viewport),
+# an item's key and its offset within the container's scrolled content.
+SCROLL_LIST_JS = """
+const [how, selector, ownText, keyAttr, visibleOnly] = arguments;
+let nodes = [];
+if (how === 'xpath') {
+    const snapshot = document.evaluate(
+        selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    for (let i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+} else {
+    nodes = Array.from(document.querySelectorAll(selector));
+}
+if (visibleOnly) nodes = nodes.filter(el => el.getClientRects().length > 0);
+const root = document.scrollingElement || document.documentElement;
+let box = nodes.length ? nodes[0].parentElement : null;
+while (box && box !== root) {
+    const overflow = getComputedStyle(box).overflowY;
+    if ((overflow === 'auto' || overflow === 'scroll') && box.scrollHeight > box.clientHeight) break;
+    box = box.parentElement;
+}
+box = box || root;
+const top = box === root ? 0 : box.getBoundingClientRect().top;
+const keyOf = el => {
+    if (keyAttr) return el.getAttribute(keyAttr);
+    const raw = ownText
+        ? Array.from(el.childNodes)
+            .filter(n => n.nodeType === Node.TEXT_NODE)
+            .map(n => n.textContent)
+            .join(' ')
+        : el.textContent;
+    return raw.replace(/\\s+/g, ' ').trim();
+};
+const offsetOf = el => Math.round(el.getBoundingClientRect().top - top + box.scrollTop);
+"""
+
+# Reads the rendered items, then scrolls the container by arguments[5] of its
+# height. moved=false means it was already at the end.
+HARVEST_SCROLL_JS = SCROLL_LIST_JS + """
+const items = nodes.map(el => [keyOf(el), offsetOf(el)]);
+const before = box.scrollTop;
+if (nodes.length && arguments[5]) box.scrollTop = before + Math.max(1, Math.floor(box.clientHeight * arguments[5]));
+return {items: items, moved: box.scrollTop !== before};
+"""
+
+# Scrolls the container so that offset arguments[5] is in the middle of the
+# view and returns the rendered item with key arguments[6] (null if none),
+# that is also within arguments[7] pixels of the offset unless that is null.
+REVEAL_ITEM_JS = SCROLL_LIST_JS + """
+const [offset, key, slack] = [arguments[5], arguments[6], arguments[7]];
+if (nodes.length) box.scrollTop = Math.max(0, offset - box.clientHeight / 2);
+return nodes.find(el => keyOf(el) === key
+    && (slack === null || Math.abs(offsetOf(el) - offset) <= slack)) || null;
+"""
+
+# Pixels two reads of the same item may differ by (sub-pixel transforms of a
+# virtual viewport) when items are keyed by position
+POSITION_SLACK = 2
+
+
+@tracer.trace_methods("action")
 class ActionDriver:
 
-    def __init__(self, driver, timeout=30, poll_frequency=0.5):
+    def __init__(self, driver, timeout=30, poll_frequency=0.5, polling="backoff", settle_timeout=5):
+        """
+        polling selects how often waits re-check their condition: 'backoff'
+        (fast first polls, doubling up to poll_frequency), 'fixed' (every
+        poll_frequency seconds) or a custom schedule object with intervals().
+        settle_timeout caps the wait settle() does after every interaction; the
+        DOM-settled waits that replaced fixed sleeps use it too, since live
+        polling keeps the DOM changing and they would otherwise run the full timeout.
+        """
         self.driver = driver
         self.timeout = timeout
+        self.settle_timeout = settle_timeout
         self.poll = poll_frequency
+        self.polling = make_schedule(polling, poll_frequency)
 
-    def wait(self):
-        return WebDriverWait(
+    def wait(self, timeout=None):
+        return PollingWait(
             self.driver,
-            self.timeout,
-            poll_frequency=self.poll
+            timeout or self.timeout,
+            self.polling
         )
 
+    @property
+    def elements(self):
+        """Element handle cache, shared by every ActionDriver of this browser session"""
+        cache = getattr(self.driver, "_element_cache", None)
+        if cache is None:
+            cache = self.driver._element_cache = ElementCache()
+        return cache
+
+    @property
+    def routes(self):
+        """Page -> route template, learned per browser session (seeded from src.routes.ROUTES)"""
+        routes = getattr(self.driver, "_routes", None)
+        if routes is None:
+            routes = self.driver._routes = dict(ROUTES)
+        return routes
+
+    def goto(self, page, location_id=None, fallback=None):
+        """
+        Navigate to a logical page and wait once for the app to be stable.
+
+        With a known route this is a single in-app router navigation. Otherwise
+        the page's click path from src.routes (or fallback, a callable doing
+        the clicks) is used, and the route it lands on is learned for the next
+        call. Returns 'route' or 'click'.
+        """
+        template = self.routes.get(page)
+        if template and (location_id is not None or "{location_id}" not in template):
+            route = template.format(location_id=location_id)
+            current = route_of(self.driver.current_url)
+            if current == route:
+                # The router ignores navigation to the current URL; the page is already open
+                return "route"
+            # Another location's page of the same route: the router reuses its view
+            reused = "{location_id}" in template and fills_template(template, current)
+            print(f" Routing to {page}: {route}")
+            self.driver.execute_script(ROUTER_NAVIGATE_JS, route)
+            self.elements.clear()
+            self.settle()
+            if self._routed(route, reused):
+                return "route"
+            print(f" Router did not land on {route}, using the click path from now on")
+            self.routes[page] = None
+
+        if fallback is None and page not in CLICK_PATHS:
+            raise ValueError(f"No route or click path for page '{page}'")
+        before = route_of(self.driver.current_url)
+        print(f" Navigating to {page} by clicks")
+        if fallback is not None:
+            self.wait_after_action(fallback, wait_type="navigation")
+        else:
+            for locator in CLICK_PATHS[page]:
+                self.wait_after_action(lambda: self.safe_click(locator), wait_type="ajax")
+
+        # Only a URL that changed and belongs to no other page identifies this one
+        learned = learn_route(self.driver.current_url, location_id)
+        if (page not in self.routes and learned and route_of(self.driver.current_url) != before
+                and learned not in self.routes.values()):
+            self.routes[page] = learned
+            print(f" Learned route for {page}: {learned}")
+        return "click"
+
+    def _routed(self, route, reused=False):
+        """
+        Whether the router rendered the page for route. pushState alone already
+        changes the URL, so the URL is only trusted when it survives settling
+        (guards and wildcard routes redirect) and a new routed view appeared.
+        When only the location ID changed (reused) the router keeps the view
+        on screen and just updates its parameters, so the settled URL is all
+        there is to check.
+        """
+        def rendered(driver):
+            if route_of(driver.current_url) != route:
+                return "redirected"
+            return reused or driver.execute_script(ROUTED_JS) is not False
+
+        try:
+            return self.wait(self.settle_timeout).until(rendered) is True
+        except TimeoutException:
+            return False
+
+    def find_cached(self, locator, timeout=None, require=None):
+        """
+        Cached handle for locator if it passes the staleness probe (one round
+        trip), otherwise a fresh wait_for_presence / wait_for_visibility.
+        """
+        element = self.elements.get(self.driver, locator, require)
+        if element is not None:
+            return element
+        if require == "clickable":
+            return self.wait_for_clickable(locator)
+        if require == "visible":
+            return self.wait_for_visibility(locator)
+        return self.wait_for_presence(locator, timeout)
+
     def wait_for_visibility(self, locator):
         try:
             print(f" Waiting for visibility: {locator}")
-            return self.wait().until(
+            return self.elements.put(locator, self.wait().until(
                 EC.visibility_of_element_located(locator)
-            )
+            ))
         except TimeoutException:
             self.fail(f"Element not visible: {locator}")
 
@@ -32,18 +373,18 @@ class ActionDriver:
         try:
             wait_timeout = timeout or self.timeout
             print(f" Waiting for presence: {locator}")
-            return WebDriverWait(self.driver, wait_timeout, poll_frequency=self.poll).until(
+            return self.elements.put(locator, self.wait(wait_timeout).until(
                 EC.presence_of_element_located(locator)
-            )
+            ))
         except TimeoutException:
             self.fail(f"Element not present: {locator}")
 
     def wait_for_clickable(self, locator):
         try:
             print(f" Waiting for clickable: {locator}")
-            return self.wait().until(
+            return self.elements.put(locator, self.wait().until(
                 EC.element_to_be_clickable(locator)
-            )
+            ))
         except TimeoutException:
             self.fail(f"Element not clickable: {locator}")
 
@@ -52,7 +393,7 @@ class ActionDriver:
         try:
             wait_timeout = timeout or self.timeout
             print(f" Waiting for element to disappear: {locator}")
-            WebDriverWait(self.driver, wait_timeout, poll_frequency=self.poll).until(
+            self.wait(wait_timeout).until(
                 EC.invisibility_of_element_located(locator)
             )
             print(f" Element disappeared: {locator}")
@@ -64,8 +405,8 @@ class ActionDriver:
         try:
             wait_timeout = timeout or self.timeout
             print(f" Waiting for text '{text}' in element: {locator}")
-            element = self.wait_for_visibility(locator)
-            WebDriverWait(self.driver, wait_timeout, poll_frequency=self.poll).until(
+            element = self.find_cached(locator, require="visible")
+            self.wait(wait_timeout).until(
                 lambda d: text in element.text
             )
             print(f" Text found in element: {locator}")
@@ -78,9 +419,10 @@ class ActionDriver:
         try:
             wait_timeout = timeout or self.timeout
             print(f" Waiting for URL to change from: {current_url}")
-            WebDriverWait(self.driver, wait_timeout, poll_frequency=self.poll).until(
+            self.wait(wait_timeout).until(
                 lambda d: d.current_url != current_url
             )
+            self.elements.clear()
             print(f" URL changed to: {self.driver.current_url}")
         except TimeoutException:
             print(f" URL did not change (may be expected)")
@@ -90,7 +432,7 @@ class ActionDriver:
         try:
             wait_timeout = timeout or self.timeout
             print(f" Waiting for URL to contain: {url_part}")
-            WebDriverWait(self.driver, wait_timeout, poll_frequency=self.poll).until(
+            self.wait(wait_timeout).until(
                 lambda d: url_part in d.current_url
             )
             print(f" URL contains: {url_part}")
@@ -106,13 +448,14 @@ class ActionDriver:
             
             # Perform the action
             action_func()
-            
+            self.elements.clear()
+
             # Wait for URL to change or page to load
-            WebDriverWait(self.driver, wait_timeout, poll_frequency=self.poll).until(
+            self.wait(wait_timeout).until(
                 lambda d: d.current_url != current_url or d.execute_script("return document.readyState") == "complete"
             )
             self.wait_for_page_load()
-            self.wait_for_ajax()
+            self.settle()
             print(f" Navigation completed")
         except TimeoutException:
             print(f" Navigation may not have occurred")
@@ -122,7 +465,7 @@ class ActionDriver:
         try:
             wait_timeout = timeout or self.timeout
             print(f" Waiting for element to become stale")
-            WebDriverWait(self.driver, wait_timeout, poll_frequency=self.poll).until(
+            self.wait(wait_timeout).until(
                 EC.staleness_of(element)
             )
             print(f" Element became stale")
@@ -134,7 +477,7 @@ class ActionDriver:
         try:
             wait_timeout = timeout or self.timeout
             print(f" Waiting for {expected_count} elements: {locator}")
-            WebDriverWait(self.driver, wait_timeout, poll_frequency=self.poll).until(
+            self.wait(wait_timeout).until(
                 lambda d: len(d.find_elements(*locator)) == expected_count
             )
             print(f" Found {expected_count} elements: {locator}")
@@ -146,8 +489,8 @@ class ActionDriver:
         try:
             wait_timeout = timeout or self.timeout
             print(f" Waiting for attribute '{attribute}' to be '{value}': {locator}")
-            element = self.wait_for_presence(locator)
-            WebDriverWait(self.driver, wait_timeout, poll_frequency=self.poll).until(
+            element = self.find_cached(locator)
+            self.wait(wait_timeout).until(
                 lambda d: element.get_attribute(attribute) == value
             )
             print(f" Attribute '{attribute}' is '{value}': {locator}")
@@ -155,11 +498,268 @@ class ActionDriver:
         except TimeoutException:
             self.fail(f"Attribute '{attribute}' did not become '{value}': {locator}")
 
+    @staticmethod
+    def _js_locator(locator):
+        """Translate a Selenium locator into an (xpath|css, selector) pair usable from JS"""
+        by, value = locator
+        if by == By.XPATH:
+            return "xpath", value
+        if by == By.CSS_SELECTOR:
+            return "css", value
+        if by == By.ID:
+            return "css", f'[id="{value}"]'
+        if by == By.NAME:
+            return "css", f'[name="{value}"]'
+        if by == By.CLASS_NAME:
+            return "css", f".{value}"
+        if by == By.TAG_NAME:
+            return "css", value
+        raise ValueError(f"Unsupported locator strategy for batched reads: {by}")
+
+    @staticmethod
+    def _require_relative(locator):
+        """
+        Scoped lookups take XPaths written against the container ('.//a',
+        '(.//a)[2]'). Rewriting a whole-page XPath would change what its
+        positions count, so an absolute one is rejected instead.
+        """
+        by, value = locator
+        if by == By.XPATH and not re.match(r"\(*\.", value):
+            raise ValueError(f"XPath must be relative to the container (start with '.'): {value}")
+
+    def find_within(self, container, locator, timeout=None):
+        """
+        Find locator inside the container element (a locator, resolved through
+        the element cache), so only that subtree is scanned. XPaths must be
+        relative to the container.
+        """
+        self._require_relative(locator)
+        key = (tuple(container), tuple(locator))
+        element = self.elements.get(self.driver, key)
+        if element is not None:
+            return element
+
+        def found(driver):
+            try:
+                return self.find_cached(container, timeout).find_element(*locator)
+            except StaleElementReferenceException:
+                return False
+
+        try:
+            print(f" Waiting for presence of {locator} within {container}")
+            return self.elements.put(key, self.wait(timeout).until(found))
+        except TimeoutException:
+            self.fail(f"Element not present within {container}: {locator}")
+
+    def read_fields(self, fields, timeout=None, scope=None):
+        """
+        Read several elements with a single script call per poll.
+
+        fields maps a name to (locator, what), where what is 'value',
+        'placeholder', 'text', 'aria-checked', 'class' (or any attribute name),
+        or a tuple of those - the first non-empty read wins. Polls until every
+        field is present (and visible, for content reads) or the timeout
+        expires; fields still missing are returned as None.
+
+        scope: optional container locator. Fields with a relative XPath
+        ('.//', '(.//...)[n]') or a CSS selector are looked up only inside that
+        subtree; absolute XPaths are evaluated against the whole document as
+        written, so their positions keep counting across the page.
+        """
+        spec = {}
+        for name, (locator, what) in fields.items():
+            how, selector = self._js_locator(locator)
+            reads = [what] if isinstance(what, str) else list(what)
+            spec[name] = [how, selector, reads]
+
+        last = {}
+        container = {"element": None}
+
+        def all_present(driver):
+            if scope is not None and container["element"] is None:
+                container["element"] = self.find_cached(scope, timeout)
+            try:
+                last.update(driver.execute_script(READ_FIELDS_JS, spec, sorted(STATE_READS), container["element"]))
+            except StaleElementReferenceException:
+                # The container was re-rendered; find it again on the next poll
+                self.elements.clear()
+                container["element"] = None
+                return False
+            return not last["missing"]
+
+        print(f" Reading {len(fields)} fields in batch")
+        try:
+            self.wait(timeout).until(all_present)
+        except TimeoutException:
+            print(f" Fields not found before timeout: {last.get('missing')}")
+
+        values = last.get("values", {})
+        return {name: values.get(name) for name in fields}
+
+    def harvest_texts(self, locator, own_text=False, stable_polls=2, timeout=None):
+        """
+        Return the normalized text of every element matching locator, read in
+        one script call per poll once the rendered list has stopped changing.
+        own_text=True only uses the element's direct text nodes.
+        """
+        how, selector = self._js_locator(locator)
+        state = {"texts": [], "stable": 0}
+
+        def settled(driver):
+            texts = driver.execute_script(HARVEST_TEXTS_JS, how, selector, own_text)
+            state["stable"] = state["stable"] + 1 if texts and texts == state["texts"] else 0
+            state["texts"] = texts
+            return state["stable"] >= stable_polls
+
+        print(f" Harvesting texts: {locator}")
+        try:
+            self.wait(timeout).until(settled)
+        except TimeoutException:
+            print(f" List did not settle before timeout, using last snapshot: {locator}")
+        return state["texts"]
+
+    def find_missing_texts(self, locator, expected, contains=False, own_text=False,
+                           timeout=None, straggler_timeout=3, scroll=False):
+        """
+        Return the expected texts that are not rendered under locator.
+
+        Everything is harvested at once and diffed in Python; anything missing
+        gets a single short combined wait instead of a full timeout per name.
+        contains=True treats a text as present if any element text contains it.
+        scroll=True harvests a virtualized/lazy-loaded list page by page
+        (harvest_scrolled); stragglers then get one more scrolled pass.
+        """
+        how, selector = self._js_locator(locator)
+
+        def missing_from(texts):
+            if contains:
+                return [e for e in expected if not any(e in t for t in texts)]
+            present = set(texts)
+            return [e for e in expected if " ".join(e.split()) not in present]
+
+        if scroll:
+            texts = list(self.harvest_scrolled(locator, own_text=own_text, timeout=timeout))
+            missing = missing_from(texts)
+            if missing:
+                print(f" {len(missing)} item(s) not seen while scrolling, harvesting once more")
+                self.wait_for_dom_settled(timeout=straggler_timeout)
+                texts += self.harvest_scrolled(locator, own_text=own_text, timeout=straggler_timeout)
+                missing = missing_from(texts)
+            return missing
+
+        missing = missing_from(self.harvest_texts(locator, own_text=own_text, timeout=timeout))
+        if missing:
+            print(f" {len(missing)} item(s) not rendered yet, waiting up to {straggler_timeout}s")
+            last = {"missing": missing}
+
+            def stragglers_rendered(driver):
+                texts = driver.execute_script(HARVEST_TEXTS_JS, how, selector, own_text)
+                last["missing"] = missing_from(texts)
+                return not last["missing"]
+
+            try:
+                self.wait(straggler_timeout).until(stragglers_rendered)
+            except TimeoutException:
+                pass
+            missing = last["missing"]
+        return missing
+
+    def harvest_scrolled(self, locator, own_text=False, key_attr=None, visible_only=False, by_position=False,
+                         page=0.8, quiet_ms=150, max_pages=500, wait_first=True, timeout=None):
+        """
+        Collect every item of a virtualized or lazy-loaded list, not just the
+        rendered window.
+
+        Reads the rendered items, scrolls their container by `page` of its
+        height, waits for the DOM to settle and repeats until the container
+        cannot scroll further and a read adds no new key. Returns
+        {key: offset} ordered by offset (pixels into the scrolled content,
+        usable with reveal_item). The key is the normalized text (own_text as
+        in harvest_texts) or the key_attr attribute, so items are unique per
+        key. by_position=True keys items by (key, offset) instead, so items
+        with the same text stay apart; generated ids are no substitute, since
+        a virtual viewport re-creates and recycles item views as it scrolls.
+        Once the container stops moving, the network must go idle (a
+        lazy-loaded list fetches its next page at the bottom) before the list
+        is taken as complete. wait_first waits up to timeout for the first
+        item to render; otherwise an empty list is returned straight away.
+        """
+        how, selector = self._js_locator(locator)
+        args = (how, selector, own_text, key_attr, visible_only)
+        state = {"step": None}
+
+        def first_page(driver):
+            state["step"] = driver.execute_script(HARVEST_SCROLL_JS, *args, page)
+            return bool(state["step"]["items"])
+
+        print(f" Harvesting scrolled list: {locator}")
+        try:
+            if wait_first:
+                self.wait(timeout).until(first_page)
+            elif not first_page(self.driver):
+                return {}
+        except TimeoutException:
+            print(f" No items rendered before timeout: {locator}")
+            return {}
+
+        items = {}
+        seen_at = {}
+        waited_at_end = False
+
+        def known(key, offset):
+            if not by_position:
+                return key in items
+            return any(abs(offset - o) <= POSITION_SLACK for o in seen_at.get(key, ()))
+
+        for pages in range(1, max_pages + 1):
+            step = state["step"]
+            new = 0
+            for key, offset in step["items"]:
+                if key and not known(key, offset):
+                    items[(key, offset) if by_position else key] = offset
+                    seen_at.setdefault(key, []).append(offset)
+                    new += 1
+            if step["moved"]:
+                waited_at_end = False
+            elif new or not waited_at_end:
+                # At the end: give a lazy-loaded list's fetch for more items time to land
+                self.wait_for_network_idle(timeout=self.settle_timeout)
+                waited_at_end = True
+            else:
+                break
+            self.wait_for_dom_settled(quiet_ms=quiet_ms, timeout=self.settle_timeout)
+            state["step"] = self.driver.execute_script(HARVEST_SCROLL_JS, *args, page)
+        else:
+            print(f" Stopped after {max_pages} pages, list may be incomplete: {locator}")
+
+        # Back to the top, where positional lookups and the user expect the list
+        self.driver.execute_script(REVEAL_ITEM_JS, *args, 0, None, None)
+        print(f" Harvested {len(items)} item(s) over {pages} page(s)")
+        return dict(sorted(items.items(), key=lambda item: item[1]))
+
+    def reveal_item(self, locator, key, offset, own_text=False, key_attr=None,
+                    visible_only=False, by_position=False, timeout=None):
+        """
+        Scroll the list's container to offset (from harvest_scrolled) and
+        return the item with that key once the virtual viewport renders it.
+        With by_position=True key is the (key, offset) pair harvest_scrolled
+        returned and the item must also be at that offset.
+        """
+        how, selector = self._js_locator(locator)
+        args = (how, selector, own_text, key_attr, visible_only)
+        match_key, slack = (key[0], POSITION_SLACK) if by_position else (key, None)
+        try:
+            return self.wait(timeout).until(
+                lambda d: d.execute_script(REVEAL_ITEM_JS, *args, offset, match_key, slack)
+            )
+        except TimeoutException:
+            self.fail(f"List item '{key}' not rendered at offset {offset}: {locator}")
+
     def safe_click(self, locator, max_retries=3):
         """Click element with retry logic for stale element references"""
         for attempt in range(max_retries):
             try:
-                element = self.wait_for_clickable(locator)
+                element = self.find_cached(locator, require="clickable")
                 self.driver.execute_script(
                     "arguments[0].scrollIntoView({block:'center'});",
                     element
@@ -168,7 +768,7 @@ class ActionDriver:
                     element.click()
                     print(f" Clicked: {locator}")
                     # Wait for any navigation or DOM changes after click
-                    self.wait_for_ajax()
+                    self.settle()
                     return
                 except StaleElementReferenceException:
                     if attempt < max_retries - 1:
@@ -177,22 +777,22 @@ class ActionDriver:
                     else:
                         # Last attempt - re-find element and use JavaScript click
                         print(f" Stale element, using JavaScript click: {locator}")
-                        element = self.wait_for_presence(locator)
+                        element = self.find_cached(locator)
                         self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", element)
                         self.driver.execute_script("arguments[0].click();", element)
                         print(f" Clicked via JavaScript: {locator}")
-                        self.wait_for_ajax()
+                        self.settle()
                         return
                 except Exception as click_error:
                     # If regular click fails (e.g., element intercepted), try JavaScript click
                     if "click intercepted" in str(click_error).lower() or "ElementClickInterceptedException" in str(type(click_error).__name__):
                         print(f" Regular click intercepted, using JavaScript click: {locator}")
-                        # Re-find element in case it's stale
-                        element = self.wait_for_presence(locator)
+                        # Cached handle after a staleness probe; re-found only if it went stale
+                        element = self.find_cached(locator)
                         self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", element)
                         self.driver.execute_script("arguments[0].click();", element)
                         print(f" Clicked via JavaScript: {locator}")
-                        self.wait_for_ajax()
+                        self.settle()
                         return
                     else:
                         raise
@@ -216,11 +816,48 @@ class ActionDriver:
             element.send_keys(value)
             print(f" Entered text into {locator}")
             # Wait for any validation or changes after input
-            self.wait_for_ajax()
+            self.settle()
         except Exception as e:
             self.fail(f"Send keys failed: {locator}", e)
 
+    def _ensure_script_timeout(self, seconds):
+        """
+        Async scripts must be allowed to run at least as long as the wait they
+        implement. The timeout belongs to the browser session, so it is tracked
+        on the driver and only ever raised: another ActionDriver of the same
+        session must not cut an async wait short.
+        """
+        current = getattr(self.driver, "_script_timeout", None)
+        if current is None or current < seconds:
+            self.driver.set_script_timeout(seconds)
+            self.driver._script_timeout = seconds
+
+    def wait_for_dom_settled(self, quiet_ms=300, timeout=None):
+        """
+        Wait until the DOM has had no mutations for quiet_ms milliseconds.
+
+        Resolves inside the browser via a MutationObserver, so a page that is
+        already quiet costs one round trip. Returns False on timeout.
+        """
+        wait_timeout = timeout or self.timeout
+        self._ensure_script_timeout(wait_timeout + 5)
+        try:
+            settled = self.driver.execute_async_script(
+                DOM_SETTLED_JS, quiet_ms, int(wait_timeout * 1000)
+            )
+        except WebDriverException as e:
+            # Navigation tears down the observer's document; wait for the new one instead
+            print(f" DOM settle interrupted ({type(e).__name__}), waiting for page load")
+            self.wait_for_page_load()
+            return True
+        if settled:
+            print(f" DOM settled ({quiet_ms}ms quiet)")
+        else:
+            print(f" DOM still changing after {wait_timeout}s")
+        return settled
+
     def wait_for_page_load(self):
+        self.elements.clear()
         try:
             self.wait().until(
                 lambda d: d.execute_script("return document.readyState") == "complete"
@@ -246,7 +883,7 @@ class ActionDriver:
         try:
             wait_timeout = timeout or self.timeout
             print(" Waiting for Angular to be ready")
-            WebDriverWait(self.driver, wait_timeout, poll_frequency=self.poll).until(
+            self.wait(wait_timeout).until(
                 lambda d: d.execute_script(
                     "return window.angular === undefined || "
                     "angular.element(document.body).injector().get('$http').pendingRequests.length === 0"
@@ -256,12 +893,88 @@ class ActionDriver:
         except TimeoutException:
             print(" Angular wait timeout (may not be using Angular)")
 
+    def wait_for_angular_stable(self, timeout=None):
+        """
+        Wait for an Angular (2+) app to become stable using its Testability API.
+
+        The browser calls back once zone.js reports no pending macrotasks or
+        HTTP requests. Returns 'stable', 'timeout' or 'unsupported' (no Angular
+        testability on the page).
+        """
+        wait_timeout = timeout or self.timeout
+        self._ensure_script_timeout(wait_timeout + 5)
+        try:
+            status = self.driver.execute_async_script(ANGULAR_STABLE_JS, int(wait_timeout * 1000))
+        except WebDriverException as e:
+            # Navigation replaced the document while waiting
+            print(f" Angular stability wait interrupted ({type(e).__name__}), waiting for page load")
+            self.wait_for_page_load()
+            return "unsupported"
+        if status == "stable":
+            print(" Angular stable")
+        elif status == "timeout":
+            print(" Angular stability wait timeout")
+        return status
+
+    def install_network_tracker(self):
+        """
+        Register the fetch/XHR tracker for every new document (Chrome only, once
+        per browser session) so requests fired during page load are counted too.
+        Other browsers get it injected lazily by wait_for_network_idle.
+        """
+        if getattr(self.driver, "_network_tracker_installed", False):
+            return
+        self.driver._network_tracker_installed = True
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            try:
+                self.driver.execute_cdp_cmd(
+                    "Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_JS}
+                )
+                print(" Network tracker registered for new documents")
+            except WebDriverException as e:
+                print(f" Could not register network tracker via CDP: {e}")
+
+    def wait_for_network_idle(self, idle_ms=500, timeout=None):
+        """
+        Wait until the page has had no fetch/XHR in flight for idle_ms milliseconds.
+
+        The tracker is (re)installed in the current document if a navigation
+        dropped it. Returns False on timeout.
+        """
+        wait_timeout = timeout or self.timeout
+        self.install_network_tracker()
+        self._ensure_script_timeout(wait_timeout + 5)
+        try:
+            idle = self.driver.execute_async_script(NETWORK_IDLE_JS, idle_ms, int(wait_timeout * 1000))
+        except WebDriverException as e:
+            print(f" Network idle wait interrupted ({type(e).__name__}), waiting for page load")
+            self.wait_for_page_load()
+            return True
+        if idle:
+            print(f" Network idle ({idle_ms}ms)")
+        else:
+            print(f" Network still busy after {wait_timeout}s")
+        return idle
+
+    def settle(self):
+        """
+        Default wait after an interaction: Angular stability, falling back to
+        AJAX polling. Capped at settle_timeout; recurring zone timers (live
+        dashboard polling) keep Angular from ever being stable, so a timeout
+        falls back to waiting for the network to go idle.
+        """
+        status = self.wait_for_angular_stable(timeout=self.settle_timeout)
+        if status == "unsupported":
+            self.wait_for_ajax()
+        elif status == "timeout":
+            self.wait_for_network_idle(timeout=self.settle_timeout)
+
     def wait_for_react(self, timeout=None):
         """Wait for React applications to be ready"""
         try:
             wait_timeout = timeout or self.timeout
             print(" Waiting for React to be ready")
-            WebDriverWait(self.driver, wait_timeout, poll_frequency=self.poll).until(
+            self.wait(wait_timeout).until(
                 lambda d: d.execute_script(
                     "return window.React === undefined || "
                     "document.querySelector('[data-reactroot]') !== null"
@@ -276,7 +989,7 @@ class ActionDriver:
         try:
             wait_timeout = timeout or self.timeout
             print(" Waiting for JavaScript to complete")
-            WebDriverWait(self.driver, wait_timeout, poll_frequency=self.poll).until(
+            self.wait(wait_timeout).until(
                 lambda d: d.execute_script("return document.readyState") == "complete" and
                          d.execute_script("return window.jQuery === undefined || jQuery.active === 0")
             )
@@ -284,7 +997,7 @@ class ActionDriver:
         except TimeoutException:
             print(" JavaScript wait timeout")
 
-    def wait_after_action(self, action_func, wait_type="ajax"):
+    def wait_after_action(self, action_func, wait_type="stable"):
         """Perform action and wait for appropriate condition"""
         current_url = self.driver.current_url
         
@@ -294,19 +1007,27 @@ class ActionDriver:
         # Wait based on type
         if wait_type == "navigation":
             self.wait_for_url_change(current_url, timeout=10)
-        elif wait_type == "ajax":
-            self.wait_for_ajax()
+        elif wait_type == "stable":
+            self.settle()
+        elif wait_type in ("ajax", "network"):
+            self.wait_for_network_idle()
         elif wait_type == "page_load":
             self.wait_for_page_load()
         elif wait_type == "js":
             self.wait_for_js_complete()
         else:
-            # Default: wait for page load and AJAX
+            # Default: wait for page load and app stability
             self.wait_for_page_load()
-            self.wait_for_ajax()
+            self.settle()
         
         return result
 
+    def save_snapshot(self, path):
+        """Write the current DOM to path, e.g. as input for benchmarks.locators"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.driver.page_source)
+        print(f" Snapshot saved: {path}")
+
     def fail(self, message, exception=None):
         print("TEST FAILED:", message)
         if exception:
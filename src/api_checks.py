@@ -0,0 +1,143 @@
+import os
+import time
+from src.http_client import ApiClient
+from src.locations_api import (
+    location_ids_count, location_records, location_settings_api, decode_energy_in, decode_env_in, decode_hc_date,
+)
+from src.prefetch import prefetch
+from src.session_cache import SessionCache, headers_from_token, validate_headers
+
+# Browserless validation of the API side of the location checks.
+# Selenium must never be imported from here (directly or through src modules).
+
+
+def resolve_headers(base_url, client, user=None):
+    """
+    Token without a browser: BONEPLUS_ACCESS_TOKEN, or the session cached by
+    a previous browser login for the user (SDET_USER or prompted).
+    """
+    token = os.getenv("BONEPLUS_ACCESS_TOKEN")
+    if token:
+        headers = {"access_token": token}
+    else:
+        user = user or os.getenv("SDET_USER") or input("Enter your user Email ID: ")
+        entry = SessionCache().load(user)
+        if not entry:
+            raise RuntimeError(
+                f"No cached session for {user}; run one browser login first or set BONEPLUS_ACCESS_TOKEN"
+            )
+        headers = headers_from_token(entry["token"])
+
+    if not validate_headers(base_url, headers, client):
+        raise RuntimeError("Access token was rejected by /v1/user/details")
+    return headers
+
+
+def _is_number(value):
+    try:
+        float(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def check_location_responses(list_entry, responses):
+    """Returns a list of (check, problem) for one location's API responses"""
+    problems = []
+
+    for key, body in responses.items():
+        if "error" in body:
+            problems.append((key, f"request failed: {body['error']}"))
+    if problems:
+        return problems
+
+    # --- /v1/location/get vs /v1/location/{id}/get ---
+    detail = responses["location_get"].get("data") or {}
+    for field in ("location_name", "country_id", "timezone_id"):
+        listed, single = list_entry.get(field), detail.get(field)
+        if isinstance(listed, str):
+            listed, single = listed.strip(), (single or "").strip()
+        if field in detail and listed != single:
+            problems.append(("location_get", f"{field} differs: list '{listed}' vs detail '{single}'"))
+
+    # --- Country / timezone lookups ---
+    if not (responses["company_v2_get"].get("data") or {}).get("name"):
+        problems.append(("company_v2_get", f"no country name for country_id {list_entry.get('country_id')}"))
+    timezone = responses["timezone_get"].get("data") or {}
+    if not (timezone.get("name") and timezone.get("gmtOffsetName")):
+        problems.append(("timezone_get", f"incomplete timezone for timezone_id {list_entry.get('timezone_id')}"))
+
+    # --- Settings field decoding ---
+    settings = responses["location_settings"].get("data") or {}
+    try:
+        cost_per_kwh, feed_in = decode_energy_in(settings["energy_in"])
+        if not (_is_number(cost_per_kwh) and _is_number(feed_in)):
+            problems.append(("energy_in", f"non-numeric tariff in '{settings['energy_in']}'"))
+    except (KeyError, IndexError, AttributeError):
+        problems.append(("energy_in", f"cannot decode '{settings.get('energy_in')}'"))
+    try:
+        _, trees = decode_env_in(settings["env_in"])
+        if not _is_number(trees):
+            problems.append(("env_in", f"non-numeric trees per kWh in '{settings['env_in']}'"))
+    except (KeyError, AttributeError):
+        problems.append(("env_in", f"cannot decode '{settings.get('env_in')}'"))
+    try:
+        if decode_hc_date(settings["hc_date"]) not in ("0", "1"):
+            problems.append(("hc_date", f"unexpected flag in '{settings['hc_date']}'"))
+    except (KeyError, AttributeError):
+        problems.append(("hc_date", f"cannot decode '{settings.get('hc_date')}'"))
+    for field in ("temp_in", "funit_in"):
+        if settings.get(field) not in ("0", "1"):
+            problems.append((field, f"unexpected value '{settings.get(field)}'"))
+    if not settings.get("cost_in"):
+        problems.append(("cost_in", "missing currency"))
+
+    # --- Preferences ---
+    preference = responses["location_preference_get"].get("data") or {}
+    mode = preference.get("mode")
+    if mode is not None and not mode.split("$$")[0].isdigit():
+        problems.append(("mode", f"cannot decode device state retain '{mode}'"))
+
+    return problems
+
+
+def run_api_checks(base_url, headers, client):
+    """Runs the cross-endpoint consistency checks for every location; returns location_id -> problems"""
+    _, location_ids, country_ids, timezone_ids, _, _ = location_ids_count(base_url, headers, client)
+    # Same streamed, cached records location_ids_count was built from
+    list_entries = {
+        record.location_id: record._asdict()
+        for record in location_records(base_url, headers, client)
+    }
+
+    def fetch(loc):
+        return location_settings_api(*loc, base_url, headers, client=client)
+
+    report = {}
+    for (loc_id, _, _), responses in prefetch(zip(location_ids, country_ids, timezone_ids), fetch):
+        report[loc_id] = check_location_responses(list_entries[loc_id], responses.result())
+    return report
+
+
+def run_api_mode(base_url):
+    start = time.monotonic()
+    with ApiClient() as client:
+        headers = resolve_headers(base_url, client)
+        report = run_api_checks(base_url, headers, client)
+
+        failed = {loc_id: problems for loc_id, problems in report.items() if problems}
+        print(f"\nAPI VALIDATION: {len(report)} locations, {len(failed)} with problems "
+              f"in {time.monotonic() - start:.1f}s (cache {client.cache.stats()})")
+        for loc_id, problems in failed.items():
+            for check, problem in problems:
+                print(f" {loc_id} [{check}] {problem}")
+
+    if failed:
+        raise AssertionError(f"API validation failed for {len(failed)} locations")
+    return report
+
+
+if __name__ == "__main__":
+    from src.main import BASE_URL
+
+    run_api_mode(os.getenv("BONEPLUS_BASE_URL", BASE_URL))
@@ -0,0 +1,102 @@
+import os
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from src.action_driver import ActionDriver
+from src.login import login_with_session_cache
+
+
+# Third-party analytics / telemetry the dashboard does not need for validation
+BLOCKED_HOSTS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+    "*sentry.io*",
+    "*facebook.net*",
+    "*segment.io*",
+]
+BLOCKED_ASSETS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp"]
+
+# Launch profiles; SDET_BROWSER_PROFILE picks one (default keeps the old behaviour)
+PROFILES = {
+    "default": {"headless": False, "lean": False, "window_size": None},
+    "lean": {"headless": False, "lean": True, "window_size": "1366,900"},
+    "headless": {"headless": True, "lean": True, "window_size": "1366,900"},
+}
+
+
+def build_options(profile, user_data_dir=None):
+    settings = PROFILES[profile]
+    options = webdriver.ChromeOptions()
+
+    if settings["headless"]:
+        options.add_argument("--headless=new")
+    if settings["window_size"]:
+        options.add_argument(f"--window-size={settings['window_size']}")
+    if settings["lean"]:
+        for arg in (
+            "--disable-extensions",
+            "--disable-background-networking",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--no-first-run",
+            "--disable-features=Translate,OptimizationHints,MediaRouter",
+            "--blink-settings=imagesEnabled=false",
+        ):
+            options.add_argument(arg)
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if user_data_dir:
+        # A pre-warmed profile keeps the HTTP cache (scripts, styles) between runs
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+    return options
+
+
+def create_driver(profile=None, user_data_dir=None, slot=None):
+    driver_path = os.getenv("CHROMEDRIVER_PATH")
+    if not driver_path:
+        raise ValueError("CHROMEDRIVER_PATH not set in environment variables")
+
+    profile = profile or os.getenv("SDET_BROWSER_PROFILE", "default")
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown browser profile '{profile}', expected one of {sorted(PROFILES)}")
+    user_data_dir = user_data_dir or os.getenv("SDET_CHROME_USER_DATA_DIR")
+    if user_data_dir and slot is not None:
+        # Chrome locks its profile, so concurrent sessions each get their own copy
+        user_data_dir = f"{user_data_dir}-{slot}"
+
+    service = Service(driver_path)
+    driver = webdriver.Chrome(service=service, options=build_options(profile, user_data_dir))
+    driver.fixed_viewport = PROFILES[profile]["window_size"] is not None
+
+    if PROFILES[profile]["lean"]:
+        # Fonts, images and telemetry never reach the network
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_HOSTS + BLOCKED_ASSETS})
+    print(f" Browser started with '{profile}' profile")
+    return driver
+
+
+def open_and_login(driver, base_url, uname, pword, client=None):
+    """Loads the dashboard, logs in (reusing a cached session if valid) and returns the API headers"""
+    action = ActionDriver(driver)
+
+    print(" Launching application")
+    driver.get(base_url)
+    if not getattr(driver, "fixed_viewport", False):
+        driver.maximize_window()
+
+    #  Robust waits (NO sleep)
+    action.wait_for_page_load()
+    action.settle()
+
+    #  Login and fetch token
+    print(" Logging in")
+    headers = login_with_session_cache(driver, base_url, uname, pword, client)
+
+    #  Post-login stabilization
+    action.wait_for_page_load()
+    action.settle()
+
+    return headers
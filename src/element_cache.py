@@ -0,0 +1,63 @@
+from selenium.common.exceptions import WebDriverException
+
+# One round trip answers "same page?", "still attached?", "visible?" and "enabled?".
+# A handle from a discarded document makes the call itself raise (stale element).
+PROBE_JS = """
+const el = arguments[0];
+const displayed = el.isConnected && el.getClientRects().length > 0;
+return [location.href, el.isConnected, displayed, displayed && !el.disabled];
+"""
+
+
+class ElementCache:
+    """
+    WebElement handles of the current page, keyed by locator.
+
+    get() hands a cached handle back only after a staleness probe; a URL
+    change seen by the probe, or clear() (called by navigation-type waits),
+    drops every handle of the old page.
+    """
+
+    def __init__(self):
+        self._url = None
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, driver, locator, require=None):
+        """require: None (attached), 'visible' or 'clickable' (visible and enabled)"""
+        locator = tuple(locator)
+        element = self._entries.get(locator)
+        if element is None:
+            self.misses += 1
+            return None
+        try:
+            url, connected, displayed, enabled = driver.execute_script(PROBE_JS, element)
+        except WebDriverException:
+            connected = False
+        else:
+            if self._url is None:
+                self._url = url
+            elif url != self._url:
+                self.clear()
+                self._url = url
+                self.misses += 1
+                return None
+
+        if not connected:
+            del self._entries[locator]
+            self.misses += 1
+            return None
+        if (require == "visible" and not displayed) or (require == "clickable" and not enabled):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return element
+
+    def put(self, locator, element):
+        self._entries[tuple(locator)] = element
+        return element
+
+    def clear(self):
+        self._entries.clear()
+        self._url = None
@@ -0,0 +1,95 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.json_stream import CHUNK_SIZE
+from src.response_cache import ResponseCache
+from src.tracing import tracer
+
+
+class ApiClient:
+    """
+    Keep-alive HTTP client shared by every API call of a run.
+
+    Wraps a single requests.Session so connections (and TLS handshakes) to the
+    BonePlus API are reused, retries idempotent requests on 5xx responses and
+    connection resets with exponential backoff, and applies default timeouts.
+    get_json() additionally serves run-invariant endpoints from a shared cache.
+    """
+
+    RETRY_STATUSES = (500, 502, 503, 504)
+
+    def __init__(self, pool_size=20, retries=3, backoff_factor=0.5, timeout=(5, 30),
+                 cache_ttl=600, cache_size=256):
+        self.timeout = timeout
+        self.cache = ResponseCache(max_entries=cache_size, ttl=cache_ttl)
+        self.session = requests.Session()
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+            # Hand the last 5xx back to the caller instead of raising RetryError
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        with tracer.span("GET", "http", url=url) as span:
+            resp = self.session.get(url, headers=headers, timeout=timeout or self.timeout, **kwargs)
+            span.tag(status=resp.status_code)
+            return resp
+
+    def get_json(self, url, headers=None, timeout=None, ttl=None):
+        """GET and decode a JSON body through the cache (errors are raised, never cached)"""
+        key = (url, tuple(sorted((headers or {}).items())))
+
+        def fetch():
+            resp = self.get(url, headers=headers, timeout=timeout)
+            resp.raise_for_status()
+            return resp.json()
+
+        return self.cache.get_or_fetch(key, fetch, ttl=ttl)
+
+    def get_records(self, url, headers=None, extract=None, timeout=None, ttl=None):
+        """
+        GET a large JSON body as a stream and cache only what extract(chunks)
+        returns (compact records); the full body is never held in memory.
+        """
+        key = ("records", extract.__name__, url, tuple(sorted((headers or {}).items())))
+
+        def fetch():
+            with self.get(url, headers=headers, timeout=timeout, stream=True) as resp:
+                resp.raise_for_status()
+                return extract(resp.iter_content(CHUNK_SIZE))
+
+        return self.cache.get_or_fetch(key, fetch, ttl=ttl)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_default_client = None
+
+
+def get_default_client():
+    """Lazily created client for callers that were not handed one explicitly"""
+    global _default_client
+    if _default_client is None:
+        _default_client = ApiClient()
+    return _default_client
@@ -0,0 +1,125 @@
+import codecs
+import json
+import re
+
+# Incremental extraction of array items from a JSON body, for responses that
+# are too big to decode (and keep) in one piece. Only the current item is
+# ever decoded; callers project it down to the fields they need.
+
+CHUNK_SIZE = 64 * 1024
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# What may follow a complete scalar (number, true, false, null) in a document
+_DELIMITERS = frozenset(" \t\n\r,]}:")
+# Marks a path key whose value was an object or array (see iter_items)
+CONTAINER = ...
+
+
+class _Cursor:
+    """Read position over a stream of byte chunks; consumed text is dropped as it goes"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _more(self):
+        while not self.eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.eof = True
+            text = self._utf8.decode(chunk or b"", final=self.eof)
+            if text:
+                self.buf = self.buf[self.pos:] + text
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self):
+        """Next non-whitespace character (not consumed), None at the end of the stream"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more():
+                return None
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in JSON stream, found {self.peek()!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode one complete JSON value, reading more chunks until it is"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._more():
+                    raise
+                continue
+            # A number is only complete once a delimiter follows it: "12." or "1e"
+            # at the end of a chunk decodes as a shorter number
+            if (not isinstance(value, (dict, list, str))
+                    and (end == len(self.buf) or self.buf[end] not in _DELIMITERS) and self._more()):
+                continue
+            self.pos = end
+            return value
+
+
+def _walk(cursor, path, keep, extras, prefix):
+    char = cursor.peek()
+    if char == "[":
+        cursor.expect("[")
+        if cursor.peek() == "]":
+            cursor.expect("]")
+            return
+        while True:
+            yield cursor.value()
+            if cursor.peek() == "]":
+                cursor.expect("]")
+                return
+            cursor.expect(",")
+    elif char == "{" and path:
+        cursor.expect("{")
+        if cursor.peek() == "}":
+            cursor.expect("}")
+            return
+        while True:
+            key = cursor.value()
+            cursor.expect(":")
+            if key == path[0]:
+                dotted = f"{prefix}{key}"
+                if cursor.peek() in ("[", "{"):
+                    extras[dotted] = CONTAINER
+                    yield from _walk(cursor, path[1:], keep, extras, f"{dotted}.")
+                else:
+                    extras[dotted] = cursor.value()
+            elif key in keep:
+                extras[f"{prefix}{key}"] = cursor.value()
+            else:
+                cursor.value()
+            if cursor.peek() == "}":
+                cursor.expect("}")
+                return
+            cursor.expect(",")
+    else:
+        cursor.value()
+
+
+def iter_items(chunks, path, keep=(), extras=None):
+    """
+    Yield the items of the array at `path` (a tuple of object keys) from a
+    JSON document arriving as byte chunks, e.g. resp.iter_content(CHUNK_SIZE).
+
+    An array met before the path is exhausted is used as is, so ("data",
+    "rooms") also covers a body whose "data" is the room list itself.
+    extras (a dict) receives, by dotted key, every path key found (CONTAINER
+    for an object/array, otherwise its value, e.g. None for null) and the
+    value of any key named in `keep` on the way down.
+    """
+    extras = {} if extras is None else extras
+    yield from _walk(_Cursor(chunks), tuple(path), set(keep), extras, "")
@@ -1,59 +1,70 @@
-from src.scheduler_check import location_settings_api, check_ui_against_api
+import time
+from src.scheduler_check import check_ui_against_api
+from src.locations_api import location_ids_count, location_settings_api
 from src.action_driver import ActionDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import requests
+from src.http_client import get_default_client
+from src.prefetch import prefetch
+from src.results import DEBUG, sink
+from src.state_store import settings_digest
+from src.tracing import tracer
 
 
-def location_ids_count(Base_url, headers):
-    loc_api_resp = requests.get(f"{Base_url}/v1/location/get", headers=headers)
-    if loc_api_resp.status_code != 200:
-        raise Exception(f"Location API failed with status {loc_api_resp.status_code}")
-
-    data = loc_api_resp.json()["data"]
-
-    api_locations = [loc["location_name"].strip() for loc in data]
-    location_ids = [loc["location_id"].strip() for loc in data]
-    country_ids = [loc["country_id"] for loc in data]
-    timezone_ids = [loc["timezone_id"] for loc in data]
-    sort_ids = [loc.get("sortid") or loc.get("sort_id", 0) for loc in data]
-
-    # Sort all lists based on sort_ids
-    combined = sorted(zip(sort_ids, api_locations, location_ids, country_ids, timezone_ids), key=lambda x: x[0])
-    sort_ids_sorted, api_locations_sorted, location_ids_sorted, country_ids_sorted, timezone_ids_sorted = zip(*combined)
-
-    length_loc = len(api_locations_sorted)
-
-    print("Sorted Locations:", api_locations_sorted)
-    print("Sorted IDs:", location_ids_sorted)
-    print("Sorted sort_ids:", sort_ids_sorted)
-
-    return list(api_locations_sorted), list(location_ids_sorted), list(country_ids_sorted), list(timezone_ids_sorted), length_loc, list(sort_ids_sorted)
+def report_presence(check, api_locations, missing_in_ui):
+    """One result per API location, plus a one-line summary on stdout"""
+    for loc_name in api_locations:
+        found = loc_name not in missing_in_ui
+        sink.record(loc_name, check, True, found, "match" if found else "missing")
+    if not missing_in_ui:
+        print(f" {check}: all {len(api_locations)} API locations are present in the UI")
+    else:
+        print(f" {check}: {len(missing_in_ui)} of {len(api_locations)} API locations missing in the UI")
 
 
-def check_locations(driver, headers, Base_url):
+def check_location_list(action, api_locations):
+    """
+    Presence of every API location in the location picker, harvested page by
+    page since large accounts virtualize/lazy-load the list. Returns the names
+    missing in the UI.
+    """
+    missing_in_ui = action.find_missing_texts(
+        (By.XPATH, "//div[@class='scroll-text']"), api_locations, scroll=True
+    )
+    report_presence("location_list", api_locations, missing_in_ui)
+    return missing_in_ui
+
+
+def click_in_list(action, xpath):
+    """
+    Click a location in the location list. The previous location's settings
+    page (or a failed router navigation) may still be open, so the list is
+    opened first.
+    """
+    action.goto("locationsetting")
+    action.wait(20).until(EC.presence_of_element_located((By.XPATH, xpath)))
+    action.safe_click((By.XPATH, xpath))
+
+
+@tracer.traced("check")
+def check_locations(driver, headers, Base_url, client=None, only=None, state=None):
+    """
+    Validates the location list, profile and every location's settings page.
+
+    only: optional set of location IDs whose settings pages are checked (used
+    by the sharded runner); state: optional StateStore, so locations whose
+    settings are unchanged since their last green check are skipped.
+    Returns location_id -> per-location result.
+    """
     action = ActionDriver(driver)
+    client = client or get_default_client()
     
     # Fetch location list from API
-    api_locations, location_ids, country_ids, timezone_ids, length_loc, sort_ids = location_ids_count(Base_url, headers)
+    api_locations, location_ids, country_ids, timezone_ids, length_loc, sort_ids = location_ids_count(Base_url, headers, client)
     
-    # === Check each location in UI ===
-    missing_in_ui = []
-    for loc_name in api_locations:
-        xpath = f"//div[@class='scroll-text'][normalize-space()='{loc_name}']"
-        try:
-            action.wait_for_presence((By.XPATH, xpath))
-            print(f"Found in UI: {loc_name}")
-        except:
-            print(f"Missing in UI: {loc_name}")
-            missing_in_ui.append(loc_name)
-
-    # === Final result ===
-    if not missing_in_ui:
-        print("All API locations are present in the UI!")
-    else:
-        print("Missing locations in UI:", missing_in_ui)
+    # === Check each location in UI (one scrolled harvest of the list, diffed against the API) ===
+    check_location_list(action, api_locations)
 
     # Select testing radio
     initial_location = action.wait_for_presence(
@@ -77,36 +88,15 @@ def check_locations(driver, headers, Base_url):
         wait_type="ajax"
     )
     
-    # Navigate to Home
-    action.wait_after_action(
-        lambda: action.safe_click((By.XPATH, "(//button[@class='mat-tooltip-trigger py-3 optsel'])[1]")),
-        wait_type="ajax"
-    )
-
-    # Navigate to Security
-    action.wait_after_action(
-        lambda: action.safe_click((By.XPATH, "(//button[@class='mat-tooltip-trigger py-3 optsel'])[4]")),
-        wait_type="ajax"
-    )
-
-    # Navigate to Settings
-    action.wait_after_action(
-        lambda: action.safe_click((By.XPATH, "(//button[@class='mat-tooltip-trigger py-3 optsel'])[5]")),
-        wait_type="ajax"
-    )
+    # Settings -> profile tab (router navigation once the route is known)
+    action.goto("profile")
 
-    # Click on profile name tab
-    action.wait_after_action(
-        lambda: action.safe_click((By.XPATH, "//div[@routerlink='./profile']")),
-        wait_type="navigation"
-    )
-    
-    r = requests.get(f"{Base_url}/v1/user/details", headers=headers)
+    r = client.get(f"{Base_url}/v1/user/details", headers=headers)
     if r.status_code != 200:
         raise Exception(f"API failed with status {r.status_code}")
 
     data = r.json()["data"]
-    print(data)
+    sink.debug(None, "user_details", data)
     name = data["name"].strip()
     email_id = data["email_id"].strip()
 
@@ -114,7 +104,7 @@ def check_locations(driver, headers, Base_url):
     el = action.wait_for_presence((By.XPATH, "//input[@type='text']"))
     ui_name = (el.get_attribute("value") or el.get_attribute("placeholder") or "").strip()
     assert ui_name == name, f"Name mismatch! API: '{name}', UI: '{ui_name}'"
-    print("API name matches with profile name", ui_name)
+    sink.record(None, "profile_name", name, ui_name)
 
     # === Email check ===
     action.safe_click((By.XPATH, "//*[name()='circle' and @id='Ellipse_210']"))
@@ -128,61 +118,71 @@ def check_locations(driver, headers, Base_url):
             return False
         return False
 
-    email_label = WebDriverWait(driver, 10).until(wait_for_non_empty_email)
+    email_label = action.wait(10).until(wait_for_non_empty_email)
     ui_email = email_label.text.strip()
 
-    if not ui_email:
-        print("UI email label text is empty. Outer HTML for debugging:")
-        print(email_label.get_attribute("outerHTML"))
+    if not ui_email and sink.level <= DEBUG:
+        sink.debug(None, "profile_email", email_label.get_attribute("outerHTML"))
 
     assert ui_email == email_id, f"Email mismatch! API: '{email_id}', UI: '{ui_email}'"
-    print("API email matches UI email.", ui_email)
+    sink.record(None, "profile_email", email_id, ui_email)
 
     # Navigate to Location Settings
-    action.wait_after_action(
-        lambda: action.safe_click((By.XPATH, "//div[@routerlink='./locationsetting']")),
-        wait_type="navigation"
-    )
-
-    missing_in_ui = []
-    for loc_name in api_locations:
-        xpath = f"(//div[contains(text(),'{loc_name}')])[1]"
-        try:
-            WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, xpath))
-            )
-            print(f"Found in UI: {loc_name}")
-        except:
-            print(f"Missing in UI: {loc_name}")
-            missing_in_ui.append(loc_name)
+    action.goto("locationsetting")
 
-    # === Final result ===
-    if not missing_in_ui:
-        print("All API locations are present in the UI!")
-    else:
-        print("Missing locations in UI:", missing_in_ui)
+    missing_in_ui = action.find_missing_texts(
+        (By.XPATH, "//div[text()]"), api_locations, contains=True, own_text=True, timeout=10
+    )
+    report_presence("location_settings_list", api_locations, missing_in_ui)
 
     res = {}
-    # Loop through locations and check API vs UI
-    for loc_name, loc_id, coun_id, time_id in zip(api_locations, location_ids, country_ids, timezone_ids):
-        try:
-            xpath = f"(//div[contains(text(),'{loc_name}')])[1]"
-            action.wait_after_action(
-                lambda: action.safe_click((By.XPATH, xpath)),
-                wait_type="navigation"
-            )
-
-            res = location_settings_api(loc_id, coun_id, time_id, Base_url, headers)
-            print("The Response is????????????", res)
+    results = {}
 
-            check_ui_against_api(driver, res)
+    def fetch_settings(loc):
+        _, loc_id, coun_id, time_id = loc
+        return location_settings_api(loc_id, coun_id, time_id, Base_url, headers, client=client)
 
-            driver.back()
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.XPATH, xpath))
-            )
-
-        except Exception as e:
-            print(f"Could not click on location '{loc_name}': {e}")
+    # Loop through locations and check API vs UI
+    # (settings for the next locations are fetched while this one is verified)
+    locations = [
+        loc for loc in zip(api_locations, location_ids, country_ids, timezone_ids)
+        if only is None or loc[1] in only
+    ]
+    for (loc_name, loc_id, coun_id, time_id), settings in prefetch(locations, fetch_settings):
+        with tracer.span("location", "location", location=loc_name):
+            started = time.perf_counter()
+            digest = None
+            try:
+                res = settings.result()
+                sink.debug(loc_name, "location_settings", res)
+
+                if state is not None and not any("error" in body for body in res.values()):
+                    digest = settings_digest(res)
+                    if state.is_unchanged(loc_id, digest):
+                        results[loc_id] = {"location": loc_name, "status": "skipped"}
+                        sink.record(loc_name, "settings_page", status="skipped", location_id=loc_id)
+                        continue
+
+                # Straight to the location's settings page once its route is learned
+                xpath = f"(//div[contains(text(),'{loc_name}')])[1]"
+                action.goto(
+                    "location_settings", location_id=loc_id,
+                    fallback=lambda: click_in_list(action, xpath)
+                )
+
+                matched = check_ui_against_api(driver, res)
+                # Not green if any field mismatched, was missing or the API lacked a key
+                results[loc_id] = {"location": loc_name, "status": "checked" if matched else "mismatch"}
+                sink.record(loc_name, "settings_page", status="match" if matched else "mismatch",
+                            duration=time.perf_counter() - started, location_id=loc_id)
+
+            except Exception as e:
+                results[loc_id] = {"location": loc_name, "status": "error", "error": str(e)}
+                sink.record(loc_name, "settings_page", status="error", duration=time.perf_counter() - started,
+                            location_id=loc_id, error=f"Could not click on location: {e}")
+
+            if digest is not None:
+                state.save(loc_id, digest, results[loc_id]["status"])
 
     print("\nLOCATION VALIDATION COMPLETED")
+    return results
@@ -0,0 +1,168 @@
+import json
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+PROFILE_MENU = (By.CSS_SELECTOR, "#Icon_awesome-user-circle")
+LOCATION_RADIO = "(//span[@class='mat-radio-outer-circle'])[{}]"
+LEARN_ATTEMPTS = 3
+# Stand-ins for the location in a learned storage template; never valid JSON
+# syntax or format fields, so stored objects round-trip unchanged
+ID_PLACEHOLDER = "@@SDET_LOCATION_ID@@"
+NAME_PLACEHOLDER = "@@SDET_LOCATION_NAME@@"
+
+STORAGE_SNAPSHOT_JS = """
+const dump = s => Object.fromEntries(Array.from({length: s.length}, (_, i) => [s.key(i), s.getItem(s.key(i))]));
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+STORAGE_SET_JS = """
+const store = arguments[0] === 'local' ? window.localStorage : window.sessionStorage;
+store.setItem(arguments[1], arguments[2]);
+"""
+
+# True once the location name is rendered as its own text somewhere visible
+# outside the location picker (menus live in the CDK overlay container).
+NAME_SHOWN_JS = """
+const name = arguments[0].replace(/\\s+/g, ' ').trim();
+const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+    if (node.nodeValue.replace(/\\s+/g, ' ').trim() !== name) continue;
+    const el = node.parentElement;
+    if (el && !el.closest('.cdk-overlay-container, mat-radio-button, mat-radio-group')
+            && el.getClientRects().length > 0) {
+        return true;
+    }
+}
+return false;
+"""
+
+
+def _template(value, location_id, location_name):
+    """
+    (template, is_json) for a stored value. A JSON value has the location ID
+    replaced in every string and strings equal to the location name replaced
+    too, so another location's name is not written along with its ID.
+    """
+    try:
+        decoded = json.loads(value)
+    except ValueError:
+        decoded = None
+    if not isinstance(decoded, (dict, list)):
+        return value.replace(location_id, ID_PLACEHOLDER), False
+
+    def strip(node):
+        if isinstance(node, dict):
+            return {k: strip(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [strip(v) for v in node]
+        if isinstance(node, str):
+            return NAME_PLACEHOLDER if node == location_name else node.replace(location_id, ID_PLACEHOLDER)
+        return node
+
+    return json.dumps(strip(decoded), separators=(",", ":")), True
+
+
+def _fill(template, is_json, location_id, location_name):
+    if is_json:
+        # Inside JSON strings, so escape the way json.dumps would
+        location_id, location_name = json.dumps(location_id)[1:-1], json.dumps(location_name)[1:-1]
+    return template.replace(ID_PLACEHOLDER, location_id).replace(NAME_PLACEHOLDER, location_name)
+
+
+def _learn_persisted_key(before, after, location_id, location_name):
+    """(storage, key, template, is_json) of the entry that started holding location_id, or None"""
+    for storage in ("local", "session"):
+        for key, value in after[storage].items():
+            if value != before[storage].get(key) and value and location_id in value:
+                return (storage, key) + _template(value, location_id, location_name)
+    return None
+
+
+def location_shown(action, location_name, timeout=5):
+    try:
+        action.wait(timeout).until(lambda d: d.execute_script(NAME_SHOWN_JS, location_name))
+        return True
+    except TimeoutException:
+        return False
+
+
+def _switch_by_click(action, radio_index):
+    driver = action.driver
+    radio_xpath = LOCATION_RADIO.format(radio_index)
+    radios = driver.find_elements(By.XPATH, radio_xpath)
+    if not (radios and radios[0].is_displayed()):
+        action.wait_after_action(lambda: action.safe_click(PROFILE_MENU), wait_type="ajax")
+    radio_btn = action.wait_for_presence((By.XPATH, radio_xpath))
+    driver.execute_script("arguments[0].scrollIntoView(true);", radio_btn)
+    driver.execute_script("arguments[0].click();", radio_btn)
+    action.wait_for_dom_settled(timeout=action.settle_timeout)
+
+
+def _switch_by_storage(action, learned, location_id, location_name, view):
+    """Write the learned storage entry and re-open view; 'storage', 'reload' or None if not picked up"""
+    driver = action.driver
+    storage, key, template, is_json = learned["key"]
+    driver.execute_script(STORAGE_SET_JS, storage, key, _fill(template, is_json, location_id, location_name))
+    if learned["reload"] == "route":
+        # Home hop so the view's components are created again from the new state
+        action.goto("home")
+        action.goto(view)
+        if location_shown(action, location_name):
+            return "storage"
+        print(" Stored location not picked up by the router, trying a reload")
+        learned["reload"] = "refresh"
+    driver.refresh()
+    action.wait_for_page_load()
+    action.settle()
+    action.goto(view)
+    if location_shown(action, location_name):
+        return "reload"
+    print(" Stored location not picked up after reload, switching by clicks from now on")
+    return None
+
+
+def switch_location(action, location_id, location_name, radio_index, view):
+    """
+    Make location_id the active location and leave the browser on `view`
+    (a page name for ActionDriver.goto), re-created for that location.
+
+    The first switch goes through the profile menu radio button and learns
+    which localStorage/sessionStorage entry the app persists the selection
+    in. Later switches just write that entry and re-open the view through
+    the router; the location name on the page must confirm it, otherwise a
+    full reload is tried once and the radio click remains the fallback.
+    Returns 'storage', 'reload' or 'click'.
+    """
+    driver = action.driver
+    learned = getattr(driver, "_location_switch", None)
+
+    if learned and learned["key"]:
+        try:
+            via = _switch_by_storage(action, learned, location_id, location_name, view)
+        except Exception as e:
+            print(f" Switching through stored state failed ({e}), switching by clicks from now on")
+            via = None
+        if via:
+            return via
+        learned["key"] = None
+        learned["attempts"] = LEARN_ATTEMPTS
+
+    if learned is None:
+        learned = driver._location_switch = {"key": None, "reload": "route", "attempts": 0}
+    learning = learned["attempts"] < LEARN_ATTEMPTS
+    before = driver.execute_script(STORAGE_SNAPSHOT_JS) if learning else None
+    _switch_by_click(action, radio_index)
+    if learning:
+        # Re-selecting the already active location changes nothing, so allow a few tries
+        learned["attempts"] += 1
+        learned["key"] = _learn_persisted_key(
+            before, driver.execute_script(STORAGE_SNAPSHOT_JS), location_id, location_name
+        )
+        if learned["key"]:
+            learned["attempts"] = LEARN_ATTEMPTS
+            print(f" Active location is persisted in {learned['key'][0]}Storage['{learned['key'][1]}']")
+
+    # Home hop so the view is created again for the new location
+    action.goto("home")
+    action.goto(view)
+    return "click"
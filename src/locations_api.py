@@ -0,0 +1,190 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+import requests
+from src.http_client import get_default_client
+from src.json_stream import CHUNK_SIZE, iter_items
+from src.results import sink
+from src.tracing import tracer
+
+# API-side helpers shared by the UI checks and the browserless API mode.
+# Keep this module free of Selenium imports.
+
+
+LocationRecord = namedtuple("LocationRecord", "location_id location_name country_id timezone_id sort_id")
+
+
+def extract_locations(chunks):
+    """Compact records from a streamed /v1/location/get body"""
+    return [
+        LocationRecord(
+            loc["location_id"].strip(),
+            loc["location_name"].strip(),
+            loc["country_id"],
+            loc["timezone_id"],
+            loc.get("sortid") or loc.get("sort_id", 0),
+        )
+        for loc in iter_items(chunks, ("data",))
+    ]
+
+
+def location_records(Base_url, headers, client=None):
+    """Every location as a LocationRecord, streamed once and cached for the run"""
+    client = client or get_default_client()
+    try:
+        return client.get_records(f"{Base_url}/v1/location/get", headers=headers, extract=extract_locations)
+    except requests.HTTPError as e:
+        raise Exception(f"Location API failed with status {e.response.status_code}")
+
+
+@tracer.traced("api")
+def location_ids_count(Base_url, headers, client=None):
+    records = location_records(Base_url, headers, client)
+
+    # Sort all lists based on sort_ids
+    combined = sorted(
+        ((r.sort_id, r.location_name, r.location_id, r.country_id, r.timezone_id) for r in records),
+        key=lambda x: x[0],
+    )
+    sort_ids_sorted, api_locations_sorted, location_ids_sorted, country_ids_sorted, timezone_ids_sorted = zip(*combined)
+
+    length_loc = len(api_locations_sorted)
+
+    print(f"Sorted {length_loc} locations")
+    sink.debug(None, "sorted_locations", {
+        "names": api_locations_sorted, "ids": location_ids_sorted, "sort_ids": sort_ids_sorted,
+    })
+
+    return list(api_locations_sorted), list(location_ids_sorted), list(country_ids_sorted), list(timezone_ids_sorted), length_loc, list(sort_ids_sorted)
+
+
+def device_rooms(client, url, headers, timeout=None):
+    """
+    Streams /v1/location/device/{id}/all keeping only what the room checks use:
+    {"rooms": [(room_id, room_name)] of non-default rooms, "room_ids": the
+    comma-separated fallback list, "data_null": True if data was null/missing}.
+    """
+    extras = {}
+    rooms = []
+    with client.get(url, headers=headers, timeout=timeout, stream=True) as resp:
+        resp.raise_for_status()
+        for room in iter_items(resp.iter_content(CHUNK_SIZE), ("data", "rooms"), keep=("room_ids",), extras=extras):
+            # Only count if is_default is False
+            if isinstance(room, dict) and room.get("is_default") is False:
+                rooms.append((
+                    room.get("room_id") or room.get("device_id") or "No ID",
+                    room.get("room_name") or room.get("device_name") or "No Name",
+                ))
+    room_ids = extras.get("data.room_ids")
+    return {
+        "rooms": rooms,
+        "room_ids": room_ids if isinstance(room_ids, str) else "",
+        "data_null": extras.get("data") is None,
+    }
+
+
+def _fetch_json(client, url, headers, timeout, cached=False):
+    try:
+        if cached:
+            return client.get_json(url, headers=headers, timeout=timeout)
+        resp = client.get(url, headers=headers, timeout=timeout)
+        resp.raise_for_status()
+        return resp.json()
+    except requests.RequestException as e:
+        return {"error": str(e)}
+
+
+@tracer.traced("api")
+def location_settings_api(loc_id, c_id, t_id, BASE_URL, HEADERS, parallel=True, request_timeout=10, deadline=30, client=None):
+    """
+    Fetches every settings endpoint for one location.
+
+    With parallel=True all endpoints are requested at once (identical URLs are
+    only fetched once) and anything not finished within `deadline` seconds is
+    reported as an error instead of blocking the run. Endpoints that are the
+    same for every location (or every location in a country/timezone) are
+    served from the client's run-scoped cache.
+    """
+    client = client or get_default_client()
+    responses = {}
+
+    endpoints = [
+        (f"{BASE_URL}/v1/location/{loc_id}/settings", "location_settings"),
+        (f"{BASE_URL}/v1/location/{loc_id}/get", "location_get"),
+        (f"{BASE_URL}/v1/company-codes/gettimezone", "company_codes_timezone"),
+        (f"{BASE_URL}/v1/location/get", "location_get_all"),
+        (f"{BASE_URL}/v1/company-v2/get/{c_id}", "company_v2_get"),
+        (f"{BASE_URL}/v1/timezone/get/{t_id}", "timezone_get"),
+        (f"{BASE_URL}/v1/location/preference/{loc_id}/get", "location_preference_get"),
+    ]
+
+    # Location independent endpoints, shared across the whole run
+    cached_keys = {"company_codes_timezone", "location_get_all", "company_v2_get", "timezone_get"}
+
+    if not parallel:
+        for url, key in endpoints:
+            responses[key] = _fetch_json(client, url, HEADERS, request_timeout, key in cached_keys)
+        return responses
+
+    # Group keys by URL so duplicate endpoints share one request
+    keys_by_url = {}
+    for url, key in endpoints:
+        keys_by_url.setdefault(url, []).append(key)
+
+    executor = ThreadPoolExecutor(max_workers=len(keys_by_url))
+    try:
+        futures = {
+            executor.submit(
+                _fetch_json, client, url, HEADERS, request_timeout,
+                any(key in cached_keys for key in keys_by_url[url])
+            ): url
+            for url in keys_by_url
+        }
+        done, _ = wait(futures, timeout=deadline)
+
+        for future, url in futures.items():
+            if future in done:
+                result = future.result()
+            else:
+                result = {"error": f"Deadline of {deadline}s exceeded for {url}"}
+            for key in keys_by_url[url]:
+                responses[key] = result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # Keep the original endpoint order in the returned dict
+    return {key: responses[key] for _, key in endpoints}
+
+
+def decode_energy_in(energy_in_str):
+    """energy_in is '$$'-separated: the 3rd value is cost per KWh, the last the feed in tariff"""
+    parts = energy_in_str.split("$$")
+    return parts[2], parts[-1]
+
+
+def decode_env_in(env_in_str):
+    """Returns (savings type label, trees per kWh) from the '$'-separated env_in value"""
+    savings = "CO₂" if env_in_str.split("$")[0] == "0" else "Trees"
+    # If no '$', just use the value directly
+    trees = env_in_str.split("$")[-1] if "$" in env_in_str else env_in_str
+    # Special case: if value is numeric zero, the UI shows 0.04
+    if trees.strip() in ["0", "0.0", "0.00"]:
+        trees = "0.04"
+    return savings, trees
+
+
+def decode_hc_date(hc_date_value):
+    """API flag part before '$$' ('1' means enabled)"""
+    return hc_date_value.split("$$")[0]
+
+
+def temperature_label(temp_in_value):
+    return "°F" if temp_in_value == "0" else "°C"
+
+
+def fuel_label(funit_in_value):
+    return "Litres" if funit_in_value == "0" else "Gallons"
+
+
+def retain_mode_label(mode):
+    """Device state retain dropdown text; the API stores seconds before '$$'"""
+    return f"{mode.split('$$')[0]} sec" if mode is not None else "5 sec"
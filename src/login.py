@@ -1,6 +1,12 @@
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import json
 from src.action_driver import ActionDriver
+from src.http_client import get_default_client
+from src.session_cache import SessionCache, headers_from_token, validate_headers
+
+DASHBOARD_MARKER = (By.XPATH, "//*[contains(text(),'Location')]")
 
 
 def login_and_get_token(driver, uname, pword):
@@ -16,8 +22,7 @@ def login_and_get_token(driver, uname, pword):
         # Click first login button
         utils.safe_click((By.XPATH, "//input[@value='Login']"))
         print(" Clicked first login button")
-        import time
-        time.sleep(2)  # Give time for the password field to appear
+        utils.wait_for_dom_settled(timeout=utils.settle_timeout)  # Give time for the password field to appear
 
         # Wait for page transition and password field to appear
         # First wait for the email field to disappear or password field to appear
@@ -61,7 +66,7 @@ def login_and_get_token(driver, uname, pword):
         print(" Clicked final login button")
 
         # Wait for dashboard load (Location text)
-        utils.wait_for_visibility((By.XPATH, "//*[contains(text(),'Location')]"))
+        utils.wait_for_visibility(DASHBOARD_MARKER)
         print(" Dashboard loaded (Location text found)")
 
         # Wait for token to be available in localStorage
@@ -94,3 +99,58 @@ def login_and_get_token(driver, uname, pword):
     except Exception as e:
         utils.fail(f"Login failed: {e}")
 
+
+def restore_session(driver, entry, timeout=10):
+    """Injects a cached token and cookies into the current page; True if the dashboard loads"""
+    utils = ActionDriver(driver)
+
+    for cookie in entry.get("cookies") or []:
+        try:
+            driver.add_cookie(cookie)
+        except WebDriverException as e:
+            print(f" Skipping cached cookie {cookie.get('name')}: {e}")
+    driver.execute_script("window.localStorage.setItem('token', arguments[0]);", entry["token"])
+
+    driver.refresh()
+    utils.wait_for_page_load()
+    utils.settle()
+    try:
+        utils.wait(timeout).until(EC.visibility_of_element_located(DASHBOARD_MARKER))
+        return True
+    except TimeoutException:
+        return False
+
+
+def login_with_session_cache(driver, base_url, uname, pword, client=None, cache=None):
+    """
+    Reuses a cached session when its token still validates against the API,
+    otherwise performs the full UI login and caches the new session.
+    Expects the dashboard to be open in the driver already.
+    """
+    client = client or get_default_client()
+    cache = cache or SessionCache()
+
+    entry = cache.load(uname)
+    if entry:
+        try:
+            headers = headers_from_token(entry["token"])
+        except (KeyError, TypeError, ValueError) as e:
+            # Corrupt entry: treat it like a rejected session
+            print(f" Cached session for {uname} is unreadable: {e}")
+            headers = None
+        if headers and validate_headers(base_url, headers, client) and restore_session(driver, entry):
+            print(" Reused cached session (UI login skipped)")
+            return headers
+
+        print(" Cached session rejected, falling back to UI login")
+        cache.clear(uname)
+        driver.delete_all_cookies()
+        driver.execute_script("window.localStorage.clear();")
+        driver.get(base_url)
+        ActionDriver(driver).wait_for_page_load()
+
+    headers = login_and_get_token(driver, uname, pword)
+
+    token_str = driver.execute_script("return window.localStorage.getItem('token');")
+    cache.save(uname, token_str, driver.get_cookies())
+    return headers
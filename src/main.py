@@ -1,9 +1,6 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from action_driver import ActionDriver
-from login import login_and_get_token
-from location_check import check_locations
-# from All_locations_notifyMe import all_loc_notifyMe
+from src.http_client import ApiClient
+from src.results import sink
+from src.tracing import tracer
 import os
 
 # To run:
@@ -14,42 +11,63 @@ BASE_URL = "https://boneplus.b1automation.com"
 
 
 def main():
+    #  SDET_MODE=api validates the API side only; Selenium is never imported
+    if os.getenv("SDET_MODE") == "api":
+        from src.api_checks import run_api_mode
+        run_api_mode(BASE_URL)
+        return
+
+    # Browser modules are imported here so the API-only mode stays Selenium free
+    from src.browser import create_driver, open_and_login
+    from src.location_check import check_locations
+    from src.sharding import run_sharded
+    from src.session_pool import run_pooled
+    from src.state_store import StateStore
+    # from src.All_locations_notifyMe import all_loc_notifyMe
+
     uname = input("Enter your user Email ID: ")
     pword = input("Enter your password: ")
 
-    driver_path = os.getenv("CHROMEDRIVER_PATH")
-    if not driver_path:
-        raise ValueError("CHROMEDRIVER_PATH not set in environment variables")
+    #  SDET_SHARDS=N splits the per-location checks across N browser sessions
+    shards = int(os.getenv("SDET_SHARDS", "1"))
+    if shards > 1:
+        run_sharded(os.getenv("SDET_CHECK", "locations"), uname, pword, BASE_URL, shards)
+        return
 
-    service = Service(driver_path)
-    driver = webdriver.Chrome(service=service)
+    #  SDET_CHECKS=locations,notify runs several checks side by side on a warm session pool
+    checks = [c.strip() for c in os.getenv("SDET_CHECKS", "").split(",") if c.strip()]
+    if len(checks) > 1:
+        with ApiClient(pool_size=int(os.getenv("API_POOL_SIZE", "20"))) as client:
+            run_pooled(checks, uname, pword, BASE_URL, client, size=int(os.getenv("SDET_POOL_SIZE", "0")) or None)
+        return
 
-    #  Initialize ActionDriver (GLOBAL helper)
-    action = ActionDriver(driver)
+    driver = create_driver()
 
-    try:
-        print(" Launching application")
-        driver.get(BASE_URL)
-        driver.maximize_window()
+    #  Opt-in tracing: SDET_TRACE=<path> writes a Chrome trace of the run
+    trace_path = os.getenv("SDET_TRACE")
+    if trace_path:
+        tracer.enable()
+        tracer.instrument_driver(driver)
 
-        #  Robust waits (NO sleep)
-        action.wait_for_page_load()
-        action.wait_for_js_and_ajax()
+    #  Shared keep-alive API client (one connection pool for the whole run)
+    client = ApiClient(pool_size=int(os.getenv("API_POOL_SIZE", "20")))
 
-        #  Login and fetch token
-        print(" Logging in")
-        headers = login_and_get_token(driver, uname, pword)
+    #  Incremental runs: unchanged, previously green locations are skipped
+    #  (SDET_INCREMENTAL=0 disables it, SDET_FULL_RUN=1 forces a full re-check)
+    state = StateStore() if os.getenv("SDET_INCREMENTAL", "1") != "0" else None
+    if state:
+        state.begin_run(force_full=os.getenv("SDET_FULL_RUN") == "1")
 
-        #  Post-login stabilization
-        action.wait_for_page_load()
-        action.wait_for_js_and_ajax()
+    try:
+        headers = open_and_login(driver, BASE_URL, uname, pword, client)
 
         #  Location validation
         print(" Starting location validations")
-        check_locations(driver, headers, BASE_URL)
+        check_locations(driver, headers, BASE_URL, client, state=state)
 
-        # all_loc_notifyMe(driver, headers, BASE_URL)
+        # all_loc_notifyMe(driver, headers, BASE_URL, client)
 
+        print(" API cache stats:", client.cache.stats())
         print(" Execution completed successfully")
 
     except Exception as e:
@@ -61,6 +79,14 @@ def main():
     finally:
         print("🧹 Closing browser")
         driver.quit()
+        client.close()
+        if state:
+            state.close()
+        sink.close()
+        print(f" Results {sink.counts()} written to {sink.path}")
+        if trace_path:
+            tracer.export_chrome_trace(trace_path)
+            tracer.print_summary()
 
 
 if __name__ == "__main__":
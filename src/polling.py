@@ -0,0 +1,88 @@
+import time
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+class FixedPolling:
+    """Poll at a constant interval (Selenium's default behaviour)"""
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+
+    def intervals(self):
+        while True:
+            yield self.interval
+
+
+class BackoffPolling:
+    """
+    Poll quickly at first and back off exponentially up to a cap, so elements
+    that show up within milliseconds are seen immediately while long waits do
+    not hammer chromedriver.
+    """
+
+    def __init__(self, initial=0.02, factor=2.0, max_interval=0.5):
+        self.initial = initial
+        self.factor = factor
+        self.max_interval = max_interval
+
+    def intervals(self):
+        interval = self.initial
+        while True:
+            yield interval
+            interval = min(interval * self.factor, self.max_interval)
+
+
+def make_schedule(polling, poll_frequency=0.5):
+    """Resolve 'fixed' / 'backoff' / a schedule instance into a polling schedule"""
+    if polling is None or polling == "backoff":
+        return BackoffPolling(max_interval=poll_frequency)
+    if polling == "fixed":
+        return FixedPolling(poll_frequency)
+    if hasattr(polling, "intervals"):
+        return polling
+    raise ValueError(f"Unknown polling strategy: {polling}")
+
+
+class PollingWait(WebDriverWait):
+    """WebDriverWait that sleeps according to a polling schedule between checks"""
+
+    def __init__(self, driver, timeout, schedule, ignored_exceptions=None):
+        super().__init__(driver, timeout, ignored_exceptions=ignored_exceptions)
+        self._schedule = schedule
+
+    def _run(self, condition, message, ignored_exceptions):
+        screen = None
+        stacktrace = None
+        end_time = time.monotonic() + self._timeout
+        intervals = self._schedule.intervals()
+        while True:
+            try:
+                done, value = condition()
+                if done:
+                    return value
+            except ignored_exceptions as exc:
+                screen = getattr(exc, "screen", None)
+                stacktrace = getattr(exc, "stacktrace", None)
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message, screen, stacktrace)
+            time.sleep(min(next(intervals), remaining))
+
+    def until(self, method, message=""):
+        def condition():
+            value = method(self._driver)
+            return bool(value), value
+
+        return self._run(condition, message, self._ignored_exceptions)
+
+    def until_not(self, method, message=""):
+        def condition():
+            try:
+                value = method(self._driver)
+            except self._ignored_exceptions:
+                return True, True
+            return not value, value
+
+        # Ignored exceptions already count as success inside condition()
+        return self._run(condition, message, ())
@@ -0,0 +1,36 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def prefetch(items, fetch, depth=2):
+    """
+    Iterate over items while API data for the next `depth` items is fetched
+    in the background.
+
+    Yields (item, future) pairs in order. Calling future.result() returns
+    fetch(item), or re-raises whatever fetch raised, so callers keep their
+    error handling exactly where the blocking call used to be. At most
+    depth + 1 fetches are outstanding at any time.
+    """
+    pending_items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=depth + 1, thread_name_prefix="prefetch")
+    queued = deque()
+
+    def submit_next():
+        for item in pending_items:
+            queued.append((item, executor.submit(fetch, item)))
+            return
+
+    try:
+        for _ in range(depth + 1):
+            submit_next()
+
+        while queued:
+            item, future = queued.popleft()
+            submit_next()
+            yield item, future
+    finally:
+        # Consumer stopped early (break / exception): drop what is still queued
+        for _, future in queued:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -0,0 +1,114 @@
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+LEVELS = {"debug": DEBUG, "info": INFO}
+
+_STOP = object()
+# Statuses written to the file only
+QUIET = ("match", "skipped", "debug")
+
+
+class ResultSink:
+    """
+    Structured check outcomes written as JSON Lines by a background thread.
+
+    record() only enqueues, so the check loops never block on stdout or disk
+    (unless the bounded queue is full, which applies back-pressure). Matches
+    go to the file only; anything else is also echoed as one short line.
+    Full API payloads are written only at debug level (SDET_LOG_LEVEL=debug).
+    """
+
+    def __init__(self, path=None, level=None, max_queue=1000):
+        self.path = path or os.getenv("SDET_RESULTS", "sdet_results.jsonl")
+        self.level = LEVELS[(level or os.getenv("SDET_LOG_LEVEL", "info")).lower()]
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._writer = None
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def _start(self):
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="result-sink", daemon=True)
+                self._writer.start()
+                atexit.register(self.close)
+
+    def _put(self, line):
+        if self._writer is None:
+            self._start()
+        self._queue.put(line)
+
+    def record(self, location, check, expected=None, actual=None, status="match", duration=None, **detail):
+        """One outcome: status is match, mismatch, missing (not in UI), skipped or error"""
+        entry = {
+            "ts": round(time.time(), 3),
+            "location": location,
+            "check": check,
+            "expected": expected,
+            "actual": actual,
+            "status": status,
+            "duration_s": None if duration is None else round(duration, 3),
+        }
+        entry.update(detail)
+        with self._lock:
+            self._counts[status] = self._counts.get(status, 0) + 1
+        self._put(entry)
+
+    def debug(self, location, check, payload):
+        """Raw payload dump, dropped unless running at debug level"""
+        if self.level > DEBUG:
+            return
+        self._put({"ts": round(time.time(), 3), "location": location, "check": check,
+                   "status": "debug", "payload": payload})
+
+    def counts(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def _write_loop(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                batch = [self._queue.get()]
+                # Drain whatever else is waiting so a burst costs one write + flush
+                while len(batch) < 256:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = any(entry is _STOP for entry in batch)
+                entries = [entry for entry in batch if entry is not _STOP]
+                f.write("".join(json.dumps(entry, default=str) + "\n" for entry in entries))
+                f.flush()
+                for entry in entries:
+                    if entry["status"] not in QUIET:
+                        print(_echo(entry), file=sys.stdout)
+                if stop:
+                    return
+
+    def close(self):
+        """Flushes everything queued so far; safe to call more than once"""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(_STOP)
+            writer.join()
+
+
+def _echo(entry):
+    line = f" {entry['status'].upper()} [{entry['check']}] {entry['location']}"
+    if entry["status"] == "mismatch":
+        line += f": UI '{entry['actual']}' != API '{entry['expected']}'"
+    elif entry.get("error"):
+        line += f": {entry['error']}"
+    return line
+
+
+sink = ResultSink()
@@ -1,14 +1,24 @@
-import requests
 import time
-from src.location_check import location_ids_count
+import traceback
+import requests
+from src.locations_api import device_rooms, location_ids_count
+from src.location_switch import switch_location
 from src.action_driver import ActionDriver
+from src.http_client import get_default_client
+from src.prefetch import prefetch
+from src.results import sink
+from src.tracing import tracer
 from selenium.webdriver.common.by import By
 
-def get_room_ids_per_location(Base_url, headers):
+ROOM_HEADERS = (By.XPATH, "//mat-expansion-panel-header[starts-with(@id,'mat-expansion-panel-header')]")
+
+@tracer.traced("api")
+def get_room_ids_per_location(Base_url, headers, client=None):
     """
     Fetches all locations and returns a dictionary of location_name -> list of room_ids.
     """
-    api_locations, location_ids, _, _, length_loc, _ = location_ids_count(Base_url, headers)
+    client = client or get_default_client()
+    api_locations, location_ids, _, _, length_loc, _ = location_ids_count(Base_url, headers, client)
     location_room_ids = {}
 
     for i in range(length_loc):
@@ -16,29 +26,27 @@ def get_room_ids_per_location(Base_url, headers):
         loc_id = location_ids[i]
 
         try:
-            # API call for this location's rooms/devices
-            resp = requests.get(f"{Base_url}/v1/location/device/{loc_id}/all", headers=headers)
-            resp.raise_for_status()
-            rooms_data = resp.json().get("data", {})
+            # API call for this location's rooms/devices (only room_ids is kept)
+            room_ids_str = device_rooms(client, f"{Base_url}/v1/location/device/{loc_id}/all", headers)["room_ids"]
 
             # Extract room_ids as a list
-            room_ids_str = rooms_data.get("room_ids", "")
             room_ids_list = room_ids_str.split(",") if room_ids_str else []
 
             location_room_ids[loc_name] = room_ids_list
 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
+            # ValueError: malformed body from the streaming parser
             print(f"Failed to get room_ids for {loc_name} ({loc_id}): {e}")
             location_room_ids[loc_name] = []
 
     return location_room_ids
 
 
-def get_rooms_count(Base_url, headers):
+def get_rooms_count(Base_url, headers, client=None):
     """
     Returns a dictionary of location_name -> number of rooms
     """
-    location_room_ids = get_room_ids_per_location(Base_url, headers)
+    location_room_ids = get_room_ids_per_location(Base_url, headers, client)
     rooms_count_dict = {loc: len(rooms) for loc, rooms in location_room_ids.items()}
 
     # Print counts
@@ -48,148 +56,125 @@ def get_rooms_count(Base_url, headers):
     return rooms_count_dict
 
 
-def room_click_count(driver, Base_url, headers):
+def ui_room_headers(action):
+    """
+    Visible room panel headers of the open Devices view, as
+    {(text, offset): offset}, paging through a virtualized list. Keyed by
+    position as well as text: rooms may share a name, and the generated
+    header ids change as a virtual viewport recycles panels.
+    """
+    # Devices render after the view's own requests complete
+    action.wait_for_dom_settled(quiet_ms=500, timeout=action.settle_timeout)
+    return action.harvest_scrolled(ROOM_HEADERS, visible_only=True, by_position=True, wait_first=False)
+
+
+def open_rooms(action, room_headers, loc_name, loc_id):
+    """Clicks each header from ui_room_headers, scrolling back to it first; failures go to the sink"""
+    driver = action.driver
+    for idx, (room_key, offset) in enumerate(room_headers.items(), start=1):
+        try:
+            room_header = action.reveal_item(
+                ROOM_HEADERS, room_key, offset, visible_only=True, by_position=True, timeout=10
+            )
+
+            # Scroll and click
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", room_header)
+            driver.execute_script("arguments[0].click();", room_header)
+
+            action.wait_for_dom_settled(timeout=action.settle_timeout)
+        except Exception as e:
+            sink.record(loc_name, "room_click", status="error", location_id=loc_id, room=idx,
+                        error=f"Failed to click Room {idx} ({room_key[0]}): {e}")
+
+
+@tracer.traced("check")
+def room_click_count(driver, Base_url, headers, client=None, only=None):
     """
     Loops through each location, selects it in the UI, and clicks on each room dynamically
     based on room_ids count from the API.
+
+    only: optional set of location IDs to visit (used by the sharded runner);
+    returns location_id -> API and UI room counts.
     """
     action = ActionDriver(driver)
+    client = client or get_default_client()
 
     # Select the first location initially
     initial_location = action.wait_for_presence((By.XPATH, "(//span[@class='mat-radio-outer-circle'])[1]"))
     driver.execute_script("arguments[0].scrollIntoView(true);", initial_location)
     driver.execute_script("arguments[0].click();", initial_location)
-    time.sleep(1)
+    action.wait_for_dom_settled(timeout=action.settle_timeout)
 
     # Click next
     action.wait_after_action(lambda: action.safe_click((By.CSS_SELECTOR, ".mat-button-wrapper")), wait_type="ajax")
-    time.sleep(1)
-
-    # Open profile menu
-    action.wait_after_action(lambda: action.safe_click((By.CSS_SELECTOR, "#Icon_awesome-user-circle")), wait_type="ajax")
-    time.sleep(1)
+    action.wait_for_dom_settled(timeout=action.settle_timeout)
 
     # Get sorted locations
-    api_locations, location_ids, _, _, length_loc, _ = location_ids_count(Base_url, headers)
+    api_locations, location_ids, _, _, length_loc, _ = location_ids_count(Base_url, headers, client)
 
-    for i in range(length_loc):
-        loc_name = api_locations[i]
-        loc_id = location_ids[i]
+    def fetch_rooms(loc_id):
+        return device_rooms(client, f"{Base_url}/v1/location/device/{loc_id}/all", headers)
 
-        print(f"\n###### Location: {loc_name}, ID: {loc_id}")
+    # Radio buttons are positional, so keep each location's index in the full list
+    selected = [(i, loc_id) for i, loc_id in enumerate(location_ids) if only is None or loc_id in only]
+    results = {}
 
-        # Ensure profile menu is open before selecting location
-        # (Except for the first iteration where it's already open)
-        if i > 0:
-            action.wait_after_action(lambda: action.safe_click((By.CSS_SELECTOR, "#Icon_awesome-user-circle")), wait_type="ajax")
-            time.sleep(1)
+    # Room lists for the next locations are fetched while this one is clicked through
+    room_responses = prefetch(selected, lambda loc: fetch_rooms(loc[1]))
 
-        # Select location radio button
-        radio_btn_xpath = f"(//span[@class='mat-radio-outer-circle'])[{i + 1}]"
-        radio_btn = action.wait_for_presence((By.XPATH, radio_btn_xpath))
-        driver.execute_script("arguments[0].scrollIntoView(true);", radio_btn)
-        driver.execute_script("arguments[0].click();", radio_btn)
-        time.sleep(1)
+    for (i, loc_id), rooms_future in room_responses:
+        loc_name = api_locations[i]
 
-        # API call to get rooms for this location
-        try:
-            print(f"📡 Fetching rooms for {loc_name} (ID: {loc_id})...")
-            rooms_resp = requests.get(f"{Base_url}/v1/location/device/{loc_id}/all", headers=headers)
-            rooms_resp.raise_for_status()
-            
-            # Print full response for debugging (only if needed)
-            # print(f"DEBUG: Response Text for {loc_name}: {rooms_resp.text}")
-            
-            full_json = rooms_resp.json()
-            rooms_data = full_json.get("data")
-            
-            room_ids_list = []
-            
-            if rooms_data is None:
-                print(f" 'data' field is null in API response for {loc_name}")
-            else:
-                room_details = []
-                rooms_list = []
-                
-                if isinstance(rooms_data, dict):
-                    rooms_list = rooms_data.get("rooms", [])
-                elif isinstance(rooms_data, list):
-                    rooms_list = rooms_data
-
-                if rooms_list:
-                    # Filter for rooms where is_default is False
-                    for r in rooms_list:
-                        if isinstance(r, dict):
-                            # Only count if is_default is False (as per user requirement)
-                            if r.get("is_default") is False:
-                                rid = r.get("room_id") or r.get("device_id") or "No ID"
-                                rname = r.get("room_name") or r.get("device_name") or "No Name"
-                                room_details.append(f"{rname} (ID: {rid})")
-                    
-                    print(f"🆔 Rooms found in API (is_default=false) for {loc_name}:")
-                    for detail in room_details:
-                        print(f"   - {detail}")
-                
-                # Fallback for comma-separated room_ids if no rooms list found
-                if not room_details and isinstance(rooms_data, dict):
-                    room_ids_raw = rooms_data.get("room_ids", "")
-                    if isinstance(room_ids_raw, str) and room_ids_raw.strip():
-                        room_details = [f"Room ID: {r.strip()}" for r in room_ids_raw.split(",") if r.strip()]
+        with tracer.span("location", "location", location=loc_name):
+            started = time.perf_counter()
 
-                room_ids_list = room_details
-            
-            print(f" Location: {loc_name} | API Room Count (filtered): {len(room_ids_list)}")
+            # Make it the active location and open its Devices view
+            switch_location(action, loc_id, loc_name, i + 1, view="devices")
 
-        except requests.RequestException as e:
-            print(f"API Request failed for {loc_name}: {e}")
-            room_ids_list = []
-        except Exception as e:
-            print(f"Error parsing rooms for {loc_name}: {e}")
-            import traceback
-            traceback.print_exc()
-            room_ids_list = []
-
-        # Navigate to Home -> Devices
-        # Home button
-        action.wait_after_action(lambda: action.safe_click((By.XPATH, "(//button[@class='mat-tooltip-trigger py-3 optsel'])[1]")), wait_type="ajax")
-        time.sleep(1)
-        # Devices button (user manually changed to index 2)
-        action.wait_after_action(lambda: action.safe_click((By.XPATH, "(//button[@class='mat-tooltip-trigger py-3 optsel'])[2]")), wait_type="ajax")
-        print(f" Waiting for devices to load for {loc_name}...")
-        time.sleep(3) 
-
-        # Count actual headers in UI (Visible only)
-        all_headers = driver.find_elements(By.XPATH, "//mat-expansion-panel-header[starts-with(@id,'mat-expansion-panel-header')]")
-        room_headers = [h for h in all_headers if h.is_displayed()]
-        ui_room_count = len(room_headers)
-        
-        print(f" Location: {loc_name} | API Room Count: {len(room_ids_list)} | UI Room Count: {ui_room_count}")
-
-        if ui_room_count == 0:
-            print(f"ℹ️ No room headers found in UI for location: {loc_name}")
-            # Reset UI and continue to next location
-            action.wait_after_action(lambda: action.safe_click((By.XPATH, "(//button[@class='mat-tooltip-trigger py-3 optsel'])[1]")), wait_type="ajax")
-            time.sleep(1)
-            continue
-
-        # Click on each room dynamically based on UI count
-        print(f" Clicking through {ui_room_count} rooms found in UI for {loc_name}...")
-        for idx in range(1, ui_room_count + 1):
+            # API call to get rooms for this location
             try:
-                room_header_xpath = f"(//mat-expansion-panel-header[starts-with(@id,'mat-expansion-panel-header')])[{idx}]"
-                room_header = action.wait_for_presence((By.XPATH, room_header_xpath), timeout=10)
-                
-                # Scroll and click
-                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", room_header)
-                time.sleep(0.5)
-                driver.execute_script("arguments[0].click();", room_header)
-                
-                print(f"   ∟  Clicked Room {idx} for Location {loc_name}")
-                time.sleep(1) 
-            except Exception as e:
-                print(f"   ∟ Failed to click Room {idx} for {loc_name}: {e}")
+                # Streamed and reduced to the non-default rooms while downloading
+                rooms_info = rooms_future.result()
+
+                room_ids_list = []
+
+                if rooms_info["data_null"]:
+                    sink.record(loc_name, "rooms_api", status="error", location_id=loc_id,
+                                error="'data' field is null in API response")
+                else:
+                    room_details = [f"{rname} (ID: {rid})" for rid, rname in rooms_info["rooms"]]
+                    if room_details:
+                        sink.debug(loc_name, "rooms_api", room_details)
+
+                    # Fallback for comma-separated room_ids if no rooms list found
+                    room_ids_raw = rooms_info["room_ids"]
+                    if not room_details and room_ids_raw.strip():
+                        room_details = [f"Room ID: {r.strip()}" for r in room_ids_raw.split(",") if r.strip()]
+
+                    room_ids_list = room_details
 
-        # After all rooms for this location are clicked, return to Home to reset the UI state
-        print(f" Completed rooms for {loc_name}. Returning to Home...")
-        action.wait_after_action(lambda: action.safe_click((By.XPATH, "(//button[@class='mat-tooltip-trigger py-3 optsel'])[1]")), wait_type="ajax")
-        time.sleep(1)
+            except requests.RequestException as e:
+                sink.record(loc_name, "rooms_api", status="error", location_id=loc_id,
+                            error=f"API Request failed: {e}")
+                room_ids_list = []
+            except Exception as e:
+                sink.record(loc_name, "rooms_api", status="error", location_id=loc_id,
+                            error=f"Error parsing rooms: {e}")
+                sink.debug(loc_name, "rooms_api", traceback.format_exc())
+                room_ids_list = []
+
+            room_headers = ui_room_headers(action)
+            ui_room_count = len(room_headers)
+
+            results[loc_id] = {
+                "location": loc_name,
+                "api_rooms": len(room_ids_list),
+                "ui_rooms": ui_room_count,
+                "status": "match" if len(room_ids_list) == ui_room_count else "mismatch",
+            }
+            sink.record(loc_name, "room_count", len(room_ids_list), ui_room_count, results[loc_id]["status"],
+                        time.perf_counter() - started, location_id=loc_id)
+
+            open_rooms(action, room_headers, loc_name, loc_id)
+
+    return results
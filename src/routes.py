@@ -0,0 +1,78 @@
+import json
+import os
+import re
+from urllib.parse import urlsplit
+from selenium.webdriver.common.by import By
+
+# Positional side-nav buttons of the dashboard shell
+NAV_BUTTON = "(//button[@class='mat-tooltip-trigger py-3 optsel'])[{}]"
+
+# Logical page -> clicks that reach it from anywhere in the dashboard shell.
+# Only used until the page's route is known (see ActionDriver.goto).
+CLICK_PATHS = {
+    "home": [(By.XPATH, NAV_BUTTON.format(1))],
+    "devices": [(By.XPATH, NAV_BUTTON.format(2))],
+    "security": [(By.XPATH, NAV_BUTTON.format(4))],
+    "settings": [(By.XPATH, NAV_BUTTON.format(5))],
+    "profile": [(By.XPATH, NAV_BUTTON.format(5)), (By.XPATH, "//div[@routerlink='./profile']")],
+    "locationsetting": [(By.XPATH, NAV_BUTTON.format(5)), (By.XPATH, "//div[@routerlink='./locationsetting']")],
+}
+
+# Known routes (page -> path, may contain {location_id}); SDET_ROUTES='{"profile": "/..."}'
+# seeds them, everything else is learned from the first successful click path.
+ROUTES = json.loads(os.getenv("SDET_ROUTES", "{}"))
+
+# In-app navigation through the Angular router: no reload, no re-bootstrap.
+# PathLocationStrategy listens to popstate, HashLocationStrategy to hashchange.
+ROUTER_NAVIGATE_JS = """
+const route = arguments[0];
+// Tag the views on screen now, so ROUTED_JS can tell whether the router rendered a new one
+document.querySelectorAll('router-outlet').forEach(outlet => {
+    if (outlet.nextElementSibling) outlet.nextElementSibling.setAttribute('data-sdet-left', '');
+});
+if (route.startsWith('#')) {
+    location.hash = route.slice(1);
+} else {
+    history.pushState(history.state, '', route);
+    window.dispatchEvent(new PopStateEvent('popstate', {state: history.state}));
+}
+"""
+
+# After ROUTER_NAVIGATE_JS: true once some router outlet shows a view that was
+# not on screen before (Angular renders routed components right after the
+# outlet), false while none does, null if the page has no router outlet.
+ROUTED_JS = """
+const outlets = Array.from(document.querySelectorAll('router-outlet'));
+if (!outlets.length) return null;
+return outlets.some(outlet => {
+    const view = outlet.nextElementSibling;
+    return view !== null && !view.hasAttribute('data-sdet-left');
+});
+"""
+
+
+def route_of(url):
+    """Router-relevant part of a URL: the hash route for hash routing, else the path"""
+    parts = urlsplit(url)
+    if parts.fragment.startswith("/"):
+        return f"#{parts.fragment}"
+    return parts.path
+
+
+def learn_route(url, location_id=None):
+    """
+    Route template for the page at url, or None if it cannot be reused.
+    A per-location page is only routable if the location ID is in its URL.
+    """
+    route = route_of(url)
+    if location_id is None:
+        return route
+    if location_id not in route:
+        return None
+    return route.replace(location_id, "{location_id}")
+
+
+def fills_template(template, route):
+    """Whether route is template with some location ID in place of {location_id}"""
+    pattern = re.escape(template).replace(re.escape("{location_id}"), "[^/?#]+")
+    return re.fullmatch(pattern, route) is not None
@@ -0,0 +1,99 @@
+import json
+import os
+import re
+import tempfile
+import time
+
+# Kept free of Selenium imports so the API-only mode can reuse cached tokens
+DEFAULT_PATH = os.getenv("SDET_SESSION_CACHE", ".sdet_session.json")
+DEFAULT_MAX_AGE = int(os.getenv("SDET_SESSION_MAX_AGE", str(8 * 3600)))
+# Cookies that carry the login; only their expiry bounds a cached session
+# (analytics and other short-lived first-party cookies do not).
+AUTH_COOKIE = re.compile(os.getenv("SDET_AUTH_COOKIES", r"sess|auth|token|jwt|sid|login"), re.IGNORECASE)
+
+
+def headers_from_token(token_str):
+    """Build API headers from the raw localStorage['token'] JSON string"""
+    token = json.loads(token_str)
+    access_token = token.get("value")
+    if not access_token:
+        raise ValueError("Access token not found in stored token")
+    return {"access_token": access_token}
+
+
+class SessionCache:
+    """
+    Persists the dashboard login (localStorage token + cookies) per user in a
+    local JSON file, so later runs and parallel workers can skip the UI login.
+    The file holds credentials and is written with owner-only permissions.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_age=DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+
+    def _read_all(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_all(self, entries):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".sdet_session")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.chmod(tmp_path, 0o600)
+            # Atomic so parallel workers never read a half-written file
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, user):
+        entry = self._read_all().get(user)
+        if not entry:
+            return None
+        if entry.get("expires_at", 0) <= time.time():
+            print(f" Cached session for {user} has expired")
+            self.clear(user)
+            return None
+        return entry
+
+    def save(self, user, token_str, cookies):
+        now = time.time()
+        expires_at = now + self.max_age
+        # An auth cookie expiring earlier bounds the whole session
+        cookie_expiries = [
+            c["expiry"] for c in cookies
+            if c.get("expiry") and AUTH_COOKIE.search(c.get("name", ""))
+        ]
+        if cookie_expiries:
+            expires_at = min(expires_at, min(cookie_expiries))
+
+        entries = self._read_all()
+        entries[user] = {
+            "token": token_str,
+            "cookies": cookies,
+            "saved_at": now,
+            "expires_at": expires_at,
+        }
+        self._write_all(entries)
+        print(f" Session cached until {time.strftime('%Y-%m-%d %H:%M', time.localtime(expires_at))}")
+
+    def clear(self, user):
+        entries = self._read_all()
+        if entries.pop(user, None) is not None:
+            self._write_all(entries)
+
+
+def validate_headers(base_url, headers, client):
+    """One cheap authenticated call to check a cached token is still accepted"""
+    try:
+        resp = client.get(f"{base_url}/v1/user/details", headers=headers, timeout=10)
+    except Exception as e:
+        print(f" Cached token validation failed: {e}")
+        return False
+    return resp.status_code == 200
@@ -0,0 +1,202 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from selenium.common.exceptions import WebDriverException
+from src.action_driver import ActionDriver
+from src.browser import create_driver, open_and_login
+from src.sharding import CHECKS
+
+
+class _LaunchFailed:
+    """Queued in place of a session whose replacement could not be launched, to wake a waiting caller"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+class PooledSession:
+    def __init__(self, slot, driver, headers):
+        self.slot = slot
+        self.driver = driver
+        self.headers = headers
+        self.uses = 0
+
+
+class SessionPool:
+    """
+    Keeps `size` logged-in browser sessions warm and hands them out through
+    session(). Sessions are health-checked on acquire, reset to the dashboard
+    in the background on release, and replaced after `max_uses` checks or
+    when they crash, so acquiring normally costs one round trip.
+    """
+
+    def __init__(self, base_url, uname, pword, size=2, max_uses=20, client=None, profile=None):
+        self.base_url = base_url
+        self.uname = uname
+        self.pword = pword
+        self.size = size
+        self.max_uses = max_uses
+        self.client = client
+        self.profile = profile
+        self._idle = queue.Queue()
+        self._slots = itertools.count()
+        self._background = ThreadPoolExecutor(max_workers=size, thread_name_prefix="session-pool")
+        self._all = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        # Sessions alive or being launched; when it drops to 0 callers fail instead of waiting
+        self._capacity = size
+
+    def start(self):
+        """
+        Launches and logs in every session in parallel; returns once all are
+        idle. If any launch fails, the others are still awaited and the whole
+        pool is closed (no browser left running) before the error is raised.
+        """
+        launches = [self._background.submit(self._launch) for _ in range(self.size)]
+        error = None
+        for launch in launches:
+            try:
+                self._idle.put(launch.result())
+            except BaseException as e:
+                error = error or e
+        if error is not None:
+            print(f" Session pool failed to start ({error}), closing it")
+            self.close()
+            raise error
+        print(f" Session pool ready with {self.size} sessions")
+        return self
+
+    def _launch(self):
+        slot = next(self._slots)
+        driver = create_driver(self.profile, slot=slot)
+        try:
+            headers = open_and_login(driver, self.base_url, self.uname, self.pword, self.client)
+        except BaseException:
+            driver.quit()
+            raise
+        session = PooledSession(slot, driver, headers)
+        with self._lock:
+            self._all.add(session)
+        return session
+
+    def _discard(self, session):
+        with self._lock:
+            self._all.discard(session)
+        try:
+            session.driver.quit()
+        except WebDriverException:
+            pass
+
+    def _launch_failed(self, error):
+        with self._lock:
+            self._capacity -= 1
+            remaining = self._capacity
+        print(f" Could not launch a replacement session ({error}); {remaining} session(s) left in the pool")
+        self._idle.put(_LaunchFailed(error))
+
+    def _relaunch(self):
+        try:
+            self._idle.put(self._launch())
+        except Exception as e:
+            self._launch_failed(e)
+
+    def _replace(self, session):
+        self._discard(session)
+        if not self._closed:
+            self._background.submit(self._relaunch)
+
+    @staticmethod
+    def _healthy(session):
+        try:
+            session.driver.execute_script("return document.readyState")
+            return True
+        except WebDriverException:
+            return False
+
+    def _reset_and_release(self, session):
+        """Back to the dashboard start page, off the caller's critical path"""
+        try:
+            session.driver.get(self.base_url)
+            action = ActionDriver(session.driver)
+            action.wait_for_page_load()
+            action.settle()
+            self._idle.put(session)
+        except Exception as e:
+            print(f" Session {session.slot} failed to reset ({e}), replacing it")
+            self._replace(session)
+
+    @contextmanager
+    def session(self, timeout=300):
+        """Yields (driver, headers) of a warm, authenticated session"""
+        if self._closed:
+            raise RuntimeError("Session pool is closed")
+        while True:
+            session = self._idle.get(timeout=timeout)
+            if not isinstance(session, _LaunchFailed):
+                break
+            if self._capacity <= 0:
+                # Leave the marker queued so every other waiter fails promptly too
+                self._idle.put(session)
+                raise RuntimeError("No browser session could be launched") from session.error
+        if not self._healthy(session):
+            print(f" Session {session.slot} is unhealthy, launching a replacement")
+            self._discard(session)
+            try:
+                session = self._launch()
+            except Exception as e:
+                self._launch_failed(e)
+                raise
+
+        session.uses += 1
+        try:
+            yield session.driver, session.headers
+        except WebDriverException:
+            # The browser (or chromedriver) died under the check: never reuse it
+            self._replace(session)
+            raise
+        except BaseException:
+            self._background.submit(self._reset_and_release, session)
+            raise
+        else:
+            if session.uses >= self.max_uses:
+                self._replace(session)
+            else:
+                self._background.submit(self._reset_and_release, session)
+
+    def close(self):
+        self._closed = True
+        self._background.shutdown(wait=True)
+        with self._lock:
+            sessions = list(self._all)
+        for session in sessions:
+            self._discard(session)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def run_pooled(checks, uname, pword, base_url, client, size=None, max_uses=20):
+    """
+    Runs several checks concurrently, each on a warm session from one pool.
+    Returns check name -> per-location results.
+    """
+    unknown = [check for check in checks if check not in CHECKS]
+    if unknown:
+        raise ValueError(f"Unknown checks {unknown}, expected some of {sorted(CHECKS)}")
+    size = size or len(checks)
+
+    def run(check):
+        with pool.session() as (driver, headers):
+            print(f" Running '{check}' check")
+            return CHECKS[check](driver, headers, base_url, client, None)
+
+    with SessionPool(base_url, uname, pword, size, max_uses, client) as pool:
+        with ThreadPoolExecutor(max_workers=size) as runner:
+            futures = {check: runner.submit(run, check) for check in checks}
+            return {check: future.result() for check, future in futures.items()}
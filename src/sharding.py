@@ -0,0 +1,84 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from src.browser import create_driver, open_and_login
+from src.http_client import ApiClient
+from src.locations_api import location_ids_count
+from src.location_check import check_locations
+from src.All_locations_notifyMe import all_loc_notifyMe
+from src.rooms import room_click_count
+
+# Check name -> callable(driver, headers, base_url, client, only)
+CHECKS = {
+    "locations": lambda driver, headers, base_url, client, only: check_locations(
+        driver, headers, base_url, client, only=only),
+    "notify": lambda driver, headers, base_url, client, only: all_loc_notifyMe(
+        driver, headers, base_url, client, only=only),
+    "rooms": lambda driver, headers, base_url, client, only: room_click_count(
+        driver, base_url, headers, client, only=only),
+}
+
+
+def shard_of(location_ids, shard_index, shard_count):
+    """Round-robin slice of the sorted location list, so every shard gets a similar mix"""
+    return set(location_ids[shard_index::shard_count])
+
+
+def _run_shard(check, uname, pword, base_url, shard_index, shard_count):
+    """Worker process: one browser session, one login, one slice of the locations"""
+    driver = create_driver(slot=shard_index)
+    client = ApiClient()
+    try:
+        headers = open_and_login(driver, base_url, uname, pword, client)
+        # Every worker sorts the same list the same way, so slices never overlap
+        _, location_ids, _, _, _, _ = location_ids_count(base_url, headers, client)
+        only = shard_of(location_ids, shard_index, shard_count)
+        print(f" Shard {shard_index + 1}/{shard_count}: {len(only)} locations")
+        return CHECKS[check](driver, headers, base_url, client, only)
+    finally:
+        driver.quit()
+        client.close()
+
+
+def run_sharded(check, uname, pword, base_url, shards=None):
+    """
+    Runs a per-location check across `shards` browser sessions in parallel
+    processes and merges the per-location results into one report.
+    """
+    if check not in CHECKS:
+        raise ValueError(f"Unknown check '{check}', expected one of {sorted(CHECKS)}")
+    shards = shards or os.cpu_count() or 1
+
+    start = time.monotonic()
+    report = {}
+    failed_shards = []
+    with ProcessPoolExecutor(max_workers=shards) as pool:
+        futures = {
+            pool.submit(_run_shard, check, uname, pword, base_url, index, shards): index
+            for index in range(shards)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                report.update(future.result())
+            except Exception as e:
+                print(f" Shard {index + 1}/{shards} failed: {e}")
+                failed_shards.append(index)
+
+    print_report(check, report, time.monotonic() - start)
+    if failed_shards:
+        raise AssertionError(f"{len(failed_shards)} of {shards} shards failed: {sorted(failed_shards)}")
+    return report
+
+
+def print_report(check, report, elapsed):
+    statuses = {}
+    for result in report.values():
+        statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+
+    print(f"\nSHARDED '{check}' RUN: {len(report)} locations in {elapsed:.1f}s")
+    for status, count in sorted(statuses.items()):
+        print(f" {status}: {count}")
+    for loc_id, result in sorted(report.items(), key=lambda item: item[1]["location"]):
+        if result["status"] not in ("checked", "match", "skipped"):
+            print(f" {result['location']} ({loc_id}): {result}")
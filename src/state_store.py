@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+# Kept free of Selenium imports, like session_cache
+DEFAULT_PATH = os.getenv("SDET_STATE_DB", ".sdet_state.sqlite")
+DEFAULT_FULL_EVERY = int(os.getenv("SDET_FULL_EVERY", "24"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    full INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS locations (
+    location_id TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    status TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    checked_at REAL NOT NULL
+);
+"""
+
+
+# location_settings_api responses that are the same for the whole tenant; hashing
+# them would change every location's digest whenever any location changes
+SHARED_KEYS = {"location_get_all", "company_codes_timezone"}
+
+
+def settings_digest(responses):
+    """Stable hash of the location-specific part of a location_settings_api result (key order independent)"""
+    own = {key: body for key, body in responses.items() if key not in SHARED_KEYS}
+    payload = json.dumps(own, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class StateStore:
+    """
+    Remembers, per location ID, the digest of its settings API responses and
+    the last UI verification result, so a run can skip locations whose
+    settings are unchanged and were green last time. Every `full_every`-th
+    run (or a forced one) re-checks everything.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, full_every=DEFAULT_FULL_EVERY):
+        self.path = path
+        self.full_every = full_every
+        self.run_id = None
+        self.full = True
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def begin_run(self, force_full=False):
+        """Registers a run and decides whether it must re-check every location"""
+        with self._conn:
+            row = self._conn.execute("SELECT MAX(id) FROM runs WHERE full = 1").fetchone()
+            last_full = row[0]
+            cursor = self._conn.execute("INSERT INTO runs (started_at, full) VALUES (?, 0)", (time.time(),))
+            self.run_id = cursor.lastrowid
+            self.full = force_full or last_full is None or self.run_id - last_full >= self.full_every
+            if self.full:
+                self._conn.execute("UPDATE runs SET full = 1 WHERE id = ?", (self.run_id,))
+
+        print(f" Run {self.run_id}: {'full re-check' if self.full else 'incremental'}")
+        return self.full
+
+    def is_unchanged(self, location_id, digest):
+        """True if this location was green last time with the same settings (never on a full run)"""
+        if self.full:
+            return False
+        row = self._conn.execute(
+            "SELECT digest, status FROM locations WHERE location_id = ?", (location_id,)
+        ).fetchone()
+        return row is not None and row[0] == digest and row[1] == "checked"
+
+    def save(self, location_id, digest, status):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO locations (location_id, digest, status, run_id, checked_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (location_id, digest, status, self.run_id or 0, time.time()),
+            )
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,158 @@
+import functools
+import json
+import os
+import threading
+import time
+
+
+class _NullSpan:
+    """Returned while tracing is disabled so `with tracer.span(...)` costs next to nothing"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def tag(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.args["outcome"] = "ok" if exc_type is None else exc_type.__name__
+        self.tracer._record(self.name, self.cat, self.start, end, self.args)
+        return False
+
+    def tag(self, **args):
+        self.args.update(args)
+
+
+class Tracer:
+    """
+    Opt-in span tracer for WebDriver round trips, ActionDriver calls and API
+    requests. Spans are exported as Chrome trace-event JSON (loadable in
+    Perfetto / chrome://tracing); nesting follows from timing per thread.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._origin = time.perf_counter()
+        self._events = []
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self._origin = time.perf_counter()
+        self.enabled = True
+
+    def span(self, name, cat="", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def _record(self, name, cat, start, end, args):
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            self._events.append(event)
+
+    def traced(self, cat, name=None):
+        """Decorator wrapping a function in a span (a single flag check when disabled)"""
+
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                tags = {}
+                # ActionDriver methods take the locator right after self
+                if len(args) > 1 and isinstance(args[1], tuple):
+                    tags["locator"] = str(args[1])
+                with self.span(span_name, cat, **tags):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def trace_methods(self, cat):
+        """Class decorator tracing every public method"""
+
+        def decorator(cls):
+            for attr, value in list(vars(cls).items()):
+                if isinstance(value, (staticmethod, classmethod)) or attr.startswith("_"):
+                    continue
+                if callable(value):
+                    setattr(cls, attr, self.traced(cat)(value))
+            return cls
+
+        return decorator
+
+    def instrument_driver(self, driver):
+        """Time every WebDriver command (find_element, execute_script, clicks, ...) of this driver"""
+        if getattr(driver, "_traced", False):
+            return driver
+        execute = driver.execute
+
+        def traced_execute(driver_command, params=None):
+            if not self.enabled:
+                return execute(driver_command, params)
+            tags = {}
+            if params:
+                if "using" in params:
+                    tags["locator"] = f"{params['using']}={params.get('value')}"
+                elif "script" in params:
+                    tags["script"] = params["script"][:80]
+            with self.span(driver_command, "webdriver", **tags):
+                return execute(driver_command, params)
+
+        driver.execute = traced_execute
+        driver._traced = True
+        return driver
+
+    def export_chrome_trace(self, path):
+        with self._lock:
+            events = list(self._events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f" Trace with {len(events)} spans written to {path}")
+
+    def slowest(self, top_n=15):
+        with self._lock:
+            events = list(self._events)
+        return sorted(events, key=lambda e: e["dur"], reverse=True)[:top_n]
+
+    def print_summary(self, top_n=15):
+        print(f"\nSLOWEST {top_n} SPANS")
+        for event in self.slowest(top_n):
+            detail = event["args"].get("locator") or event["args"].get("url") or ""
+            print(f" {event['dur'] / 1000:10.1f} ms  [{event['cat']}] {event['name']} {detail}")
+
+
+# Process-wide tracer, enabled by main when SDET_TRACE is set
+tracer = Tracer()
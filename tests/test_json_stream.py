@@ -0,0 +1,106 @@
+"""
+Unit tests for src/json_stream.py: every sample body is fed split at every
+byte offset (and one byte at a time), and must give the same items and
+extras as decoding it in one piece.
+
+    python -m pytest tests/test_json_stream.py
+"""
+import json
+import unittest
+
+from src.json_stream import CONTAINER, iter_items
+from src.locations_api import extract_locations
+
+SAMPLES = [
+    # (body, path, keep)
+    ('{"took": 12.5, "data": [{"id": 1}, {"id": 2}]}', ("data",), ()),
+    ('{"data": [1, -2.5e-3, 1E+10, 0, -0.0, 123456789]}', ("data",), ()),
+    ('{"data": [true, false, null, "a,b]}", "\\u00e9\\"x"], "n": -7e2}', ("data",), ()),
+    ('{"status": 200, "data": {"room_ids": "r1,r2", "rooms": [{"room_id": "r1", "is_default": false}]}}',
+     ("data", "rooms"), ("room_ids",)),
+    ('{"data": {"rooms": [], "room_ids": ""}, "total": 1.25}', ("data", "rooms"), ("room_ids",)),
+    ('{"data": null, "message": "no rooms"}', ("data", "rooms"), ("room_ids",)),
+    ('{"data": [{"room_name": "Küche", "n": 3.14159}]}', ("data", "rooms"), ()),
+    ('  {\n "data" : [ 1 ,\t2 ] , "after": 99999 }\n', ("data",), ()),
+    ('[]', ("data",), ()),
+]
+
+LOCATIONS = json.dumps({
+    "took": 0.125,
+    "data": [
+        {"location_id": " loc-1 ", "location_name": "Head Office ", "country_id": 1, "timezone_id": 2, "sortid": 10},
+        {"location_id": "loc-2", "location_name": "Café", "country_id": 3, "timezone_id": 4, "sort_id": 2.5},
+    ],
+})
+
+
+def _expected(body, path, keep):
+    """Items and extras worked out from the fully decoded document"""
+    node, extras, prefix = json.loads(body), {}, ""
+    for depth, key in enumerate(path):
+        if isinstance(node, list):
+            break
+        if not isinstance(node, dict):
+            return [], extras
+        for name in keep:
+            if name in node and name != key:
+                extras[f"{prefix}{name}"] = node[name]
+        if key not in node:
+            return [], extras
+        node = node[key]
+        extras[f"{prefix}{key}"] = CONTAINER if isinstance(node, (dict, list)) else node
+        prefix = f"{prefix}{key}."
+    return (node if isinstance(node, list) else []), extras
+
+
+def _run(chunks, path, keep):
+    extras = {}
+    items = list(iter_items(chunks, path, keep=keep, extras=extras))
+    return items, extras
+
+
+class IterItemsTest(unittest.TestCase):
+
+    def test_split_at_every_byte_offset(self):
+        for body, path, keep in SAMPLES:
+            data = body.encode("utf-8")
+            expected = _expected(body, path, keep)
+            for offset in range(len(data) + 1):
+                with self.subTest(body=body, offset=offset):
+                    self.assertEqual(_run([data[:offset], data[offset:]], path, keep), expected)
+
+    def test_one_byte_chunks(self):
+        for body, path, keep in SAMPLES:
+            data = body.encode("utf-8")
+            with self.subTest(body=body):
+                chunks = [data[i:i + 1] for i in range(len(data))]
+                self.assertEqual(_run(chunks, path, keep), _expected(body, path, keep))
+
+    def test_number_split_inside_exponent_or_fraction(self):
+        data = b'{"took": 12.5, "data": [1e-3]}'
+        for cut in (b"12", b"12.", b"1e", b"1e-"):
+            offset = data.index(cut) + len(cut)
+            with self.subTest(cut=cut):
+                self.assertEqual(_run([data[:offset], data[offset:]], ("data",), ()), ([0.001], {"data": CONTAINER}))
+
+    def test_malformed_body_raises_value_error(self):
+        for body in (b'{"data": [1, 2', b'{"data": [1 2]}', b'{"data": [12.]}'):
+            with self.subTest(body=body), self.assertRaises(ValueError):
+                _run([body], ("data",), ())
+
+
+class ExtractLocationsTest(unittest.TestCase):
+
+    def test_split_at_every_byte_offset(self):
+        data = LOCATIONS.encode("utf-8")
+        expected = [
+            ("loc-1", "Head Office", 1, 2, 10),
+            ("loc-2", "Café", 3, 4, 2.5),
+        ]
+        for offset in range(len(data) + 1):
+            with self.subTest(offset=offset):
+                self.assertEqual(extract_locations([data[:offset], data[offset:]]), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()